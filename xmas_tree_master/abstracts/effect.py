@@ -1,10 +1,42 @@
-# abstracts/effect.py
+import copy
 from abc import ABC, abstractmethod
 
+import numpy as np
+
+from controllers.pixel_buffer import PixelBuffer
+from geometry.led_geometry import LEDGeometry
+from schemas.config_schema import ConfigSchema
+
+
 class Effect(ABC):
     """
     Abstract base class for LED effects.
+
+    Effects implement one of two contracts:
+
+    * ``render(frame)`` (preferred): write the (r, g, b) colors of every LED for
+      one frame into ``frame``, an ``(N, 3)`` uint8 array, using array math on
+      ``self.coords_array`` (an ``(N, 3)`` float32 array) and the precomputed
+      ``self.geometry`` (see ``LEDGeometry``).
+    * ``update()`` (legacy): assign an (r, g, b) tuple to each ``self.pixels[i]``.
+
+    The pixel buffer reorders colors to the strip's color order on flush.
+
+    ``render`` may update a frame incrementally when it receives the same
+    array as on its previous call, so callers must not modify that array
+    between calls.
+
+    Each contract is adapted onto the other, so callers can drive any effect
+    through either method.
+
+    Parameters are declared by ``default_config`` and typed by ``parameters``
+    (a ``Parameter`` per key; undeclared keys are typed after their default).
+    ``RegisterEffect`` compiles both into ``config_schema``, which validates
+    and converts the config once at construction; ``get_config`` then
+    returns the converted values.
     """
+    parameters = {}
+    config_schema = None
 
     @property
     @abstractmethod
@@ -15,7 +47,12 @@ class Effect(ABC):
         """
         Initialize the effect.
         """
+        if type(self).render is Effect.render and type(self).update is Effect.update:
+            raise TypeError(f"{type(self).__name__} must implement render() or update().")
+
         self.config = kwargs
+        schema = type(self).config_schema
+        self.params = schema.resolve(kwargs) if schema is not None else None  # Converted parameter values
         self.pixels = self.config['pixels']
         self.coords = self.config['coords']
         self.min_y = self.config['min_y']
@@ -26,20 +63,109 @@ class Effect(ABC):
         self.max_z = self.config['max_z']
         self.center = self.config['center']
 
+        # Shared geometry from the controller, or built here for standalone use
+        self.geometry = self.config.get('geometry') or LEDGeometry(self.coords)
+        self.coords_array = self.geometry.positions
+        self.frame = np.zeros((self.geometry.count, 3), dtype=np.uint8)
+
     @property
     @abstractmethod
     def default_config(self):
         pass
 
-    @abstractmethod
+    def render(self, frame):
+        """
+        Write the LED colors for one frame into ``frame`` (an ``(N, 3)`` uint8 array).
+
+        Adapter for legacy effects: runs ``update()`` and copies ``self.pixels``.
+        """
+        self.update()
+        if isinstance(self.pixels, PixelBuffer):
+            frame[:] = self.pixels.data
+        else:
+            frame[:] = [tuple(self.pixels[i]) for i in range(len(frame))]
+
     def update(self):
         """
         Update the LED colors for one frame of the effect.
+
+        Adapter for vectorized effects: renders into ``self.frame`` and writes
+        the result to ``self.pixels``.
         """
-        pass
+        self.render(self.frame)
+        if isinstance(self.pixels, PixelBuffer):
+            self.pixels.write(self.frame)
+        else:
+            for i, color in enumerate(self.frame.tolist()):
+                self.pixels[i] = tuple(color)
 
-    def get_config(self, key, parser):
+    def warm_up(self):
+        """
+        Build lazily computed caches (e.g. the geometry's spatial index) before
+        the effect goes live, by rendering one frame of a copy of the effect
+        into a scratch frame. The effect itself still starts at its first frame.
+
+        Legacy ``update()`` effects are not warmed up, as they draw into the
+        live pixel buffer.
+        """
+        if type(self).render is Effect.render:
+            return
+        scratch = copy.deepcopy(self, {id(self.pixels): self.pixels})
+        scratch.render(np.zeros_like(self.frame))
+
+    def cycle_frames(self):
+        """
+        Number of frames after which this effect's output repeats, or None if
+        it is random or not periodic. Periodic effects can be baked into a
+        frame cache and played back.
+        """
+        return None
+
+    def get_config(self, key, parser=None):
         """
         Obtain config value or default if not present.
+
+        Registered effects get the value converted by their schema; ``parser``
+        is only used by effects without a schema.
         """
+        if self.params is not None:
+            return self.params[key]
         return parser(self.config[key]) if key in self.config else self.default_config[key]
+
+    def update_config(self, **changes):
+        """
+        Patch parameters of the running effect without rebuilding it, keeping its animation state.
+
+        Values are validated and converted by the effect's schema and stored
+        on the attribute of the same name. Nothing is applied if any value is
+        invalid or ``config_changed`` fails.
+        :return: Names of the parameters whose value changed.
+        """
+        if type(self).config_schema is None:
+            raise ValueError(f"{type(self).__name__} has no live parameters")
+        parsed = type(self).config_schema.validate(changes)
+
+        previous = {key: getattr(self, key, None) for key, value in parsed.items() if getattr(self, key, None) != value}
+        previous_config = {key: self.config.get(key) for key in previous}
+        for key in previous:
+            setattr(self, key, parsed[key])
+            self.params[key] = parsed[key]
+            self.config[key] = changes[key]
+        if previous:
+            try:
+                self.config_changed(previous)
+            except Exception:
+                # Roll back, e.g. if a derived resource could not be rebuilt
+                for key, value in previous.items():
+                    setattr(self, key, value)
+                    self.params[key] = value
+                    self.config[key] = previous_config[key]
+                raise
+        return list(previous)
+
+    def config_changed(self, previous):
+        """
+        Called after a live parameter update, to recompute state derived from the changed parameters.
+        :param previous: Previous value of every changed parameter, by name.
+        """
+        pass
@@ -0,0 +1,154 @@
+# benchmark.py
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from utils.load_coords import load_coords
+from utils.generate_xmas_tree_coords import generate_xmas_tree
+from controllers.led_controller import LEDController
+from controllers.effect_controller import EffectController
+from registry.effect_registry import EffectRegistry
+
+with redirect_stdout(sys.stderr):
+    import utils.register_effects
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+MEMORY_FRAMES = 10
+# Effects that cannot run without external input (playback needs a recording file)
+EXCLUDED_EFFECTS = {"playback"}
+
+
+def synthetic_tree(led_count, seed=0):
+    """
+    Generates a reproducible synthetic tree with ``led_count`` LEDs.
+    """
+    np.random.seed(seed)
+    trunk = led_count // 20
+    return generate_xmas_tree(num_points_foliage=led_count - trunk, num_points_trunk=trunk)
+
+
+def make_effect(selector, coords):
+    """
+    Builds a dry-mode controller for ``coords`` and the effect ``selector`` on it.
+    """
+    random.seed(0)
+    np.random.seed(0)
+    controller = LEDController(coords, pixel_count=len(coords), drymode=True, fps=None)
+    effect_controller = EffectController(controller)
+    try:
+        with redirect_stdout(sys.stderr):
+            effect_controller.change_effect(selector)
+    finally:
+        effect_controller.close()  # Leave no background threads running into the timings
+    return controller.effect
+
+
+def bench_effect(selector, coords, frames):
+    """
+    Runs one effect headless for ``frames`` frames without sleeping.
+    """
+    effect = make_effect(selector, coords)
+    latencies = np.empty(frames)
+    clock = time.perf_counter
+    start = clock()
+    for i in range(frames):
+        frame_start = clock()
+        effect.update()
+        latencies[i] = clock() - frame_start
+    elapsed = clock() - start
+
+    # Peak memory is measured in a separate, shorter pass so tracing does not skew the timings
+    tracemalloc.start()
+    effect = make_effect(selector, coords)
+    for _ in range(min(frames, MEMORY_FRAMES)):
+        effect.update()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {
+        "fps": round(frames / elapsed, 2),
+        "latency_ms": {
+            "p50": round(p50, 4),
+            "p95": round(p95, 4),
+            "p99": round(p99, 4),
+            "max": round(latencies.max() * 1000, 4),
+        },
+        "peak_memory_kb": round(peak / 1024, 1),
+    }
+
+
+def run(trees, selectors, frames):
+    results = []
+    for tree_name, coords in trees:
+        for selector in selectors:
+            print(f"Benchmarking {selector} on {tree_name} ({len(coords)} LEDs)", file=sys.stderr)
+            result = {"effect": selector, "tree": tree_name, "leds": len(coords)}
+            result.update(bench_effect(selector, coords, frames))
+            results.append(result)
+    return results
+
+
+def find_regressions(results, baseline, threshold):
+    """
+    Returns the results whose fps dropped more than ``threshold`` (a fraction) below the baseline.
+    """
+    baseline_fps = {(r["effect"], r["tree"]): r["fps"] for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        previous = baseline_fps.get((result["effect"], result["tree"]))
+        if previous and result["fps"] < previous * (1 - threshold):
+            regressions.append({
+                "effect": result["effect"],
+                "tree": result["tree"],
+                "baseline_fps": previous,
+                "fps": result["fps"],
+            })
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless LED effect benchmark")
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--sizes', type=int, nargs='*', default=DEFAULT_SIZES)
+    parser.add_argument('--effects', nargs='*', default=None, help="Effect selectors (default: all registered)")
+    parser.add_argument('--real', action=argparse.BooleanOptionalAction, default=True,
+                        help="Include the real tree from coords.json")
+    parser.add_argument('--output', help="Write the JSON report to this file instead of stdout")
+    parser.add_argument('--baseline', help="JSON report to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Allowed fps drop against the baseline, as a fraction")
+    args = parser.parse_args()
+
+    trees = []
+    if args.real:
+        trees.append(("coords.json", load_coords()))
+    for size in args.sizes:
+        trees.append((f"synthetic-{size}", synthetic_tree(size)))
+
+    selectors = args.effects or [effect["selector"] for effect in EffectRegistry.list_effects()
+                                 if effect["selector"] not in EXCLUDED_EFFECTS]
+    report = {"frames": args.frames, "results": run(trees, selectors, args.frames)}
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["regressions"] = find_regressions(report["results"], baseline, args.threshold)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if report.get("regressions"):
+        for regression in report["regressions"]:
+            print(f"Regression: {regression['effect']} on {regression['tree']}: "
+                  f"{regression['baseline_fps']} -> {regression['fps']} fps", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import threading
+
+
+class ConfigStore:
+    """
+    In-memory store of the saved per-client effect defaults.
+
+    All ``configs/<client_id>/<effect>_default.json`` files are loaded once and
+    served from memory. A background thread picks up files edited, added or
+    removed outside the store (by their mtime) and persists saves: a save
+    updates memory right away and is written shortly after, together with
+    any other saves of the same burst, to a temp file that is then renamed
+    over the old one.
+    """
+
+    SUFFIX = "_default.json"
+
+    def __init__(self, directory="configs", flush_delay=0.5, poll_interval=2.0):
+        """
+        :param directory: Directory holding one subdirectory of defaults per client.
+        :param flush_delay: Seconds to wait after a save for more saves to write together.
+        :param poll_interval: Seconds between scans for external edits.
+        """
+        self.directory = directory
+        self.flush_delay = flush_delay
+        self.poll_interval = poll_interval
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.configs = {}  # (client_id, effect_name) -> config
+        self.mtimes = {}  # (client_id, effect_name) -> mtime of the file the config was read from or written to
+        self.dirty = {}  # (client_id, effect_name) -> config not yet written
+        self.scan()
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def get(self, client_id, effect_name):
+        """
+        Saved defaults of a client for an effect, or an empty dict.
+        """
+        with self.lock:
+            return dict(self.configs.get((client_id, effect_name), {}))
+
+    def save(self, client_id, effect_name, config):
+        """
+        Store new defaults; they are written to disk in the background.
+        """
+        key = (client_id, effect_name)
+        with self.lock:
+            self.configs[key] = dict(config)
+            self.dirty[key] = self.configs[key]
+        self.wake.set()
+
+    def flush(self):
+        """
+        Write all pending saves now.
+        """
+        with self.lock:
+            pending, self.dirty = self.dirty, {}
+        for (client_id, effect_name), config in pending.items():
+            try:
+                mtime = self._write(self._path(client_id, effect_name), config)
+            except OSError as e:
+                print(f"Error saving config for {client_id}, effect {effect_name}: {e}")
+                continue
+            with self.lock:
+                self.mtimes[(client_id, effect_name)] = mtime
+
+    def scan(self):
+        """
+        Load config files that are new or changed on disk and forget deleted ones.
+        """
+        seen = set()
+        if os.path.isdir(self.directory):
+            for client in os.scandir(self.directory):
+                if not client.is_dir():
+                    continue
+                for entry in os.scandir(client.path):
+                    if not entry.name.endswith(self.SUFFIX):
+                        continue
+                    key = (client.name, entry.name[:-len(self.SUFFIX)])
+                    seen.add(key)
+                    mtime = entry.stat().st_mtime_ns
+                    if self.mtimes.get(key) == mtime:
+                        continue
+                    try:
+                        with open(entry.path, "r") as f:
+                            config = json.load(f)
+                    except (OSError, ValueError) as e:
+                        print(f"Error loading config {entry.path}: {e}")
+                        continue
+                    with self.lock:
+                        if key not in self.dirty:  # A pending save wins over the file
+                            self.configs[key] = config
+                            self.mtimes[key] = mtime
+        with self.lock:
+            for key in set(self.mtimes) - seen:
+                if key not in self.dirty:
+                    self.configs.pop(key, None)
+                    del self.mtimes[key]
+
+    def close(self):
+        """
+        Stop the background thread and write pending saves.
+        """
+        self.running = False
+        self.wake.set()
+        self.thread.join()
+        self.flush()
+
+    def _run(self):
+        while self.running:
+            if self.wake.wait(self.poll_interval):
+                self.wake.clear()
+                time.sleep(self.flush_delay)  # Let the rest of a burst of saves arrive
+                self.flush()
+            self.scan()
+
+    def _path(self, client_id, effect_name):
+        return os.path.join(self.directory, client_id, f"{effect_name}{self.SUFFIX}")
+
+    @staticmethod
+    def _write(path, config):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(config, f)
+        os.replace(temp_path, path)
+        return os.stat(path).st_mtime_ns
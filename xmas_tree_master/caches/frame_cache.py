@@ -0,0 +1,144 @@
+import os
+import json
+import hashlib
+import inspect
+
+import numpy as np
+
+from abstracts.effect import Effect
+
+
+class FrameCache:
+    """
+    Disk cache of baked effect cycles, played back from memory-mapped files.
+
+    A periodic effect (one whose ``cycle_frames()`` is not None) is rendered
+    for one full cycle into a ``.npy`` frame file. The file is keyed by a hash
+    of the effect selector, the merged config, the effect's defaults and
+    source code, and the LED coordinates, so changing any of them bakes a new
+    file. Least recently used files are evicted once the cache exceeds
+    ``max_bytes``; a cycle that alone exceeds it is not baked.
+    """
+
+    def __init__(self, directory="cache/frames", max_bytes=256 * 1024 * 1024):
+        """
+        :param directory: Where the frame files are stored.
+        :param max_bytes: Disk budget of the cache.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def key(self, selector, effect_class, config, geometry):
+        """
+        Hash identifying one baked cycle.
+        """
+        source_file = inspect.getsourcefile(effect_class)
+        with open(source_file, "rb") as f:
+            source_hash = hashlib.sha256(f.read()).hexdigest()
+        description = json.dumps({
+            "selector": selector,
+            "config": config,
+            "defaults": effect_class.default_config,
+            "source": source_hash,
+            "coords": geometry.content_hash,
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(description.encode("utf-8")).hexdigest()[:32]
+
+    def load(self, key):
+        """
+        Memory-map a baked cycle, or return None if it is not cached.
+        """
+        path = self._path(key)
+        if not os.path.isfile(path):
+            return None
+        os.utime(path)  # Mark as recently used
+        return np.load(path, mmap_mode="r")
+
+    def cycle_bytes(self, effect):
+        """
+        Size of one baked cycle of ``effect`` on disk, without the file header.
+        """
+        return effect.cycle_frames() * effect.geometry.count * 3
+
+    def bake(self, key, effect):
+        """
+        Render one full cycle of ``effect`` into the cache and memory-map it.
+        """
+        if self.cycle_bytes(effect) > self.max_bytes:
+            raise ValueError(f"A cycle of {effect.cycle_frames()} frames does not fit the frame cache")
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        frame_count = effect.cycle_frames()
+        frames = np.lib.format.open_memmap(temp_path, mode="w+", dtype=np.uint8,
+                                           shape=(frame_count, effect.geometry.count, 3))
+        for i in range(frame_count):
+            effect.render(effect.frame)
+            frames[i] = effect.frame
+        frames.flush()
+        del frames
+        os.replace(temp_path, path)
+        self.evict(keep=key)
+        return np.load(path, mmap_mode="r")
+
+    def get_or_bake(self, key, effect):
+        """
+        Memory-map the cached cycle of ``effect``, baking it first if needed.
+        :return: The frames, or None if the cycle is too big for the cache and the effect should run live.
+        """
+        frames = self.load(key)
+        if frames is not None:
+            return frames
+        if self.cycle_bytes(effect) > self.max_bytes:
+            print(f"Not baking {effect.cycle_frames()} frames, they exceed the frame cache budget")
+            return None
+        return self.bake(key, effect)
+
+    def evict(self, keep=None):
+        """
+        Delete least recently used frame files until the cache fits its budget.
+        :param keep: Key of a cycle that must stay, e.g. the one just baked.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npy"):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if name == f"{keep}.npy":
+                continue
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npy")
+
+
+class BakedEffect(Effect):
+    """
+    Plays back a baked effect cycle by copying the next frame out of the cache.
+    """
+    name = "Baked Effect"
+    default_config = None
+
+    def __init__(self, frames, effect_selector, effect_config=None, **kwargs):
+        """
+        :param frames: (F, N, 3) uint8 frames of one cycle (usually memory-mapped).
+        :param effect_selector: Selector of the baked effect.
+        :param effect_config: Config the effect was baked with, to rebuild it with changes.
+        """
+        super().__init__(**kwargs)
+        self.frames = frames
+        self.effect_selector = effect_selector
+        self.effect_config = dict(effect_config or {})
+        self.position = 0
+
+    def warm_up(self):
+        pass  # Already rendered
+
+    def render(self, frame):
+        frame[:] = self.frames[self.position]
+        self.position = (self.position + 1) % len(self.frames)
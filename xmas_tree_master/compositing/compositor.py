@@ -0,0 +1,129 @@
+import numpy as np
+
+from abstracts.effect import Effect
+
+
+class Layer:
+    """
+    One effect in a layer stack, with its blend mode and opacity.
+
+    Blend modes combine the layer's frame ``src`` with the composite of the
+    layers below it ``dst``:
+
+    * ``"add"``: dst + src, saturating at full brightness.
+    * ``"max"``: the brighter of dst and src per channel.
+    * ``"multiply"``: dst * src, so black in the layer blacks out what is below.
+    * ``"alpha"``: src where the layer is lit, dst where it is black.
+    * ``"mask"``: dst scaled by the layer's brightness; the layer itself is not shown.
+
+    The opacity fades between dst (0) and the blended result (1).
+    """
+    BLEND_MODES = ("add", "max", "multiply", "alpha", "mask")
+    # Modes in which an all-black layer leaves the layers below unchanged
+    TRANSPARENT_WHEN_BLACK = ("add", "max", "alpha")
+
+    def __init__(self, effect, blend="alpha", opacity=1.0, enabled=True):
+        """
+        :param effect: The Effect rendering this layer.
+        :param blend: One of BLEND_MODES.
+        :param opacity: Opacity in [0, 1].
+        :param enabled: Disabled layers are neither rendered nor blended.
+        """
+        self.effect = effect
+        self.set(blend=blend, opacity=opacity, enabled=enabled)
+
+    def set(self, blend=None, opacity=None, enabled=None):
+        """
+        Change the blend mode, opacity or enabled state; None keeps the current value.
+        """
+        if blend is not None:
+            if blend not in self.BLEND_MODES:
+                raise ValueError(f"Unknown blend mode: {blend}")
+            self.blend = blend
+        if opacity is not None:
+            self.opacity = min(max(float(opacity), 0.0), 1.0)
+        if enabled is not None:
+            self.enabled = bool(enabled)
+
+    def describe(self):
+        return {
+            "effect_name": getattr(self.effect, "effect_selector", type(self.effect).__name__),
+            "blend": self.blend,
+            "opacity": self.opacity,
+            "enabled": self.enabled,
+        }
+
+
+class Compositor(Effect):
+    """
+    Renders an ordered stack of layers, bottom first, and blends them into one frame.
+
+    Every layer's effect renders into its own frame. Blending runs on a
+    preallocated float32 composite, so the cost per layer is a handful of
+    array operations over the LEDs. Layers that are disabled, fully
+    transparent, or black in a mode where black changes nothing are skipped.
+    The stack is capped at MAX_LAYERS so the blending cost per frame stays bounded.
+    """
+    name = "Layers"
+    effect_selector = "layers"
+    default_config = None
+    MAX_LAYERS = 8
+
+    def __init__(self, layers, **kwargs):
+        """
+        :param layers: Layers, bottom first.
+        """
+        super().__init__(**kwargs)
+        if len(layers) > self.MAX_LAYERS:
+            raise ValueError(f"At most {self.MAX_LAYERS} layers are supported, got {len(layers)}")
+        self.layers = list(layers)
+        count = self.geometry.count
+        self.composite = np.zeros((count, 3), dtype=np.float32)
+        self.source = np.zeros((count, 3), dtype=np.float32)
+        self.blended = np.zeros((count, 3), dtype=np.float32)
+
+    def warm_up(self):
+        for layer in self.layers:
+            layer.effect.warm_up()
+
+    def render(self, frame):
+        composite = self.composite
+        composite[:] = 0
+        for layer in self.layers:
+            if not layer.enabled or layer.opacity <= 0:
+                continue
+            layer_frame = layer.effect.frame
+            layer.effect.render(layer_frame)
+            if layer.blend in Layer.TRANSPARENT_WHEN_BLACK and not layer_frame.any():
+                continue
+            self.source[:] = layer_frame
+            self._blend(layer.blend, layer.opacity)
+        np.rint(composite, out=composite)
+        np.copyto(frame, composite, casting="unsafe")
+
+    def _blend(self, mode, opacity):
+        dst, src, out = self.composite, self.source, self.blended
+        if mode == "add":
+            np.add(dst, src, out=out)
+            np.minimum(out, 255, out=out)
+        elif mode == "max":
+            np.maximum(dst, src, out=out)
+        elif mode == "multiply":
+            np.multiply(dst, src, out=out)
+            out *= 1 / 255
+        elif mode == "alpha":
+            np.copyto(out, dst)
+            np.copyto(out, src, where=src.any(axis=1, keepdims=True))
+        elif mode == "mask":
+            np.multiply(dst, src.max(axis=1, keepdims=True) * (1 / 255), out=out)
+
+        if opacity >= 1:
+            dst[:] = out
+        else:
+            # dst + (out - dst) * opacity
+            out -= dst
+            out *= opacity
+            dst += out
+
+    def describe(self):
+        return [layer.describe() for layer in self.layers]
@@ -0,0 +1,77 @@
+import time
+import threading
+from collections import OrderedDict
+
+from controllers.render_stats import RollingHistogram, TIME_EDGES
+
+
+class CommandQueue:
+    """
+    Bounded queue of control commands, applied by the render loop between frames.
+
+    Commands are callables queued under a key, e.g. (topic, client_id). A new
+    command for a key that is still queued supersedes the old one, so a burst
+    of messages (a dragged slider) is applied once, with the latest value.
+    If the queue is full, the oldest command is dropped.
+    """
+
+    def __init__(self, max_size=64, clock=time.perf_counter):
+        """
+        :param max_size: Maximum number of queued commands.
+        :param clock: Clock used to measure how long commands wait.
+        """
+        self.max_size = max_size
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.pending = OrderedDict()  # key -> (command, enqueue time)
+        self.latency = RollingHistogram(TIME_EDGES, window=100)
+        self.max_depth = 0
+        self.applied = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self.pending)
+
+    def put(self, key, command):
+        """
+        Queue ``command`` (a callable without arguments), superseding a queued command with the same key.
+        """
+        with self.lock:
+            if key in self.pending:
+                del self.pending[key]
+                self.coalesced += 1
+            elif len(self.pending) >= self.max_size:
+                self.pending.popitem(last=False)
+                self.dropped += 1
+            self.pending[key] = (command, self.clock())
+            self.max_depth = max(self.max_depth, len(self.pending))
+
+    def drain(self):
+        """
+        Apply all queued commands in order. Called once per frame by the render loop.
+        :return: Number of commands applied.
+        """
+        with self.lock:
+            if not self.pending:
+                return 0
+            commands = list(self.pending.values())
+            self.pending.clear()
+        for command, queued_at in commands:
+            try:
+                command()
+            except Exception as e:
+                print(f"Error applying command: {e}")
+            self.latency.record(self.clock() - queued_at)
+        self.applied += len(commands)
+        return len(commands)
+
+    def summary(self):
+        return {
+            "depth": len(self.pending),
+            "max_depth": self.max_depth,
+            "applied": self.applied,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "latency_ms": self.latency.summary(1000),
+        }
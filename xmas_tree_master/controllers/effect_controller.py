@@ -1,18 +1,126 @@
 # controllers/effect_controller.py
-import os
-import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from registry.effect_registry import EffectRegistry
+from caches.config_store import ConfigStore
+from caches.frame_cache import BakedEffect
+from compositing.compositor import Compositor, Layer
 
 class EffectController:
     """
     Manages LED effects and dynamically switches between them.
     """
-    def __init__(self, controller):
+    def __init__(self, controller, frame_cache=None, background=False, config_store=None):
+        """
+        :param controller: The LEDController effects are rendered on.
+        :param frame_cache: Optional FrameCache; periodic effects are then baked and played back from it.
+        :param background: Construct new effects on a worker thread instead of the calling thread.
+        :param config_store: ConfigStore with the saved per-client defaults; one on "configs" is opened on first use by default.
+        """
         self.controller = controller
+        self.frame_cache = frame_cache
+        self._config_store = config_store
+        self.owns_config_store = config_store is None
+        self.config_store_lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="effect-builder") if background else None
+
+    @property
+    def config_store(self):
+        """
+        The ConfigStore, opened on first use so controllers that never touch saved defaults start no poller thread.
+        """
+        with self.config_store_lock:
+            if self._config_store is None:
+                self._config_store = ConfigStore()
+            return self._config_store
+
+    def close(self):
+        """
+        Stop the builder thread and close the config store if this controller opened it.
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
+        with self.config_store_lock:
+            if self.owns_config_store and self._config_store is not None:
+                self._config_store.close()
+                self._config_store = None
 
-    def change_effect(self, effect_name, client_id=None, **kwargs):
+    def change_effect(self, effect_name, client_id=None, crossfade=None, **kwargs):
         """
         Change the current effect.
+        :param crossfade: Seconds to fade from the previous effect; the controller's default if None.
+        """
+        self._switch(lambda: self._build_effect(effect_name, client_id, kwargs), effect_name, crossfade)
+
+    def set_layers(self, layers, client_id=None, crossfade=None):
+        """
+        Replace the current effect with a stack of blended effect layers.
+        :param layers: Layer specs, bottom first: dicts with effect_name and optional config, blend and opacity.
+        """
+        def build():
+            stack = []
+            for spec in layers:
+                effect = self._build_effect(spec["effect_name"].lower(), client_id, spec.get("config", {}))
+                stack.append(Layer(effect, blend=spec.get("blend", "alpha"), opacity=spec.get("opacity", 1.0),
+                                   enabled=spec.get("enabled", True)))
+            return Compositor(stack, **self._effect_args())
+
+        self._switch(build, [spec["effect_name"] for spec in layers], crossfade)
+
+    def update_config(self, client_id=None, **changes):
+        """
+        Patch parameters of the current effect in place, keeping its animation state.
+
+        Baked effects cannot be patched; they are rebuilt from their config with the changes instead.
+        """
+        effect = self.controller.effect
+        if effect is None:
+            raise ValueError("No effect is running")
+        if isinstance(effect, BakedEffect):
+            config = dict(effect.effect_config, **changes)
+            self.change_effect(effect.effect_selector, client_id=client_id, crossfade=0, **config)
+            return
+        changed = effect.update_config(**changes)
+        print(f"Effect config updated: {', '.join(changed) or 'no changes'}")
+
+    def _switch(self, build, description, crossfade):
+        """
+        Build and warm up a new effect, then hand it to the controller, on the worker thread if there is one.
+        """
+        requested_at = time.perf_counter()
+
+        def run():
+            effect = build()
+            effect.warm_up()  # Build lazily built caches away from the render loop
+            self.controller.set_effect(effect, crossfade=crossfade, requested_at=requested_at)
+            print(f"Effect updated to: {description}")
+
+        if self.executor is None:
+            run()
+        else:
+            self.executor.submit(self._report_errors, run)
+
+    @staticmethod
+    def _report_errors(function):
+        try:
+            function()
+        except Exception as e:
+            print(f"Error changing effect: {e}")
+
+    def update_layer(self, index, blend=None, opacity=None, enabled=None):
+        """
+        Change the blend mode, opacity or enabled state of one layer of the current layer stack.
+        """
+        effect = self.controller.effect
+        if not isinstance(effect, Compositor):
+            raise ValueError("The current effect is not a layer stack")
+        effect.layers[index].set(blend=blend, opacity=opacity, enabled=enabled)
+        print(f"Layer {index} updated to: {effect.layers[index].describe()}")
+
+    def _build_effect(self, effect_name, client_id, config):
+        """
+        Construct an effect with the client's saved defaults and ``config``, baked if a frame cache is set.
         """
         effect_class = EffectRegistry.get_effect(effect_name)
         if not effect_class:
@@ -21,9 +129,21 @@ class EffectController:
         # Load saved defaults if available
         saved_config = self._load_saved_config(client_id, effect_name)
         merged_config = saved_config.copy()
-        merged_config.update(kwargs)
+        merged_config.update(config)
 
-        effect = effect_class(
+        effect = effect_class(**self._effect_args(), **merged_config)
+        if self.frame_cache is not None and effect.cycle_frames() is not None:
+            key = self.frame_cache.key(effect_name, effect_class, merged_config, self.controller.geometry)
+            frames = self.frame_cache.get_or_bake(key, effect)
+            if frames is not None:  # Otherwise the cycle is too long to bake and the effect runs live
+                effect = BakedEffect(frames, effect_name, effect_config=merged_config, **self._effect_args())
+        return effect
+
+    def _effect_args(self):
+        """
+        Arguments every effect is constructed with.
+        """
+        return dict(
             pixels=self.controller.pixels,
             coords=self.controller.coords,
             min_y=self.controller.min_y,
@@ -33,20 +153,14 @@ class EffectController:
             min_z=self.controller.min_z,
             max_z=self.controller.max_z,
             center=self.controller.three_d_center,
-            **merged_config
+            geometry=self.controller.geometry,
         )
-        self.controller.set_effect(effect)
-        print(f"Effect updated to: {effect_name}")
 
     def save_default_config(self, client_id, effect_name, config):
         """
-        Saves new default config for the given client/effect.
+        Saves new default config for the given client/effect. It is written to disk in the background.
         """
-        directory = f"configs/{client_id}"
-        os.makedirs(directory, exist_ok=True)
-        path = os.path.join(directory, f"{effect_name}_default.json")
-        with open(path, "w") as f:
-            json.dump(config, f)
+        self.config_store.save(client_id, effect_name, config)
         print(f"Default config saved for {client_id}, effect {effect_name}")
 
     def _load_saved_config(self, client_id, effect_name):
@@ -55,8 +169,4 @@ class EffectController:
         """
         if not client_id:
             return {}
-        path = f"configs/{client_id}/{effect_name}_default.json"
-        if os.path.isfile(path):
-            with open(path, "r") as f:
-                return json.load(f)
-        return {}
+        return self.config_store.get(client_id, effect_name)
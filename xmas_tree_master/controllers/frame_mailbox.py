@@ -0,0 +1,67 @@
+import threading
+
+import numpy as np
+
+
+class FrameMailbox:
+    """
+    Bounded "latest frame" mailbox between the render loop and its consumers.
+
+    Frames are copied into a small preallocated ring of uint8 buffers when
+    published, so memory stays bounded no matter how slowly (or whether) the
+    consumers read, and a consumer always gets the newest complete frame.
+
+    The mailbox also remembers the sequence number in which each LED last
+    changed, so consumers can fetch only the LEDs that changed since the
+    frame they already have.
+    """
+
+    def __init__(self, pixel_count, slots=3):
+        """
+        :param pixel_count: Number of LEDs per frame.
+        :param slots: Number of preallocated frame buffers (at least 2).
+        """
+        self.buffers = np.zeros((max(2, slots), pixel_count, 3), dtype=np.uint8)
+        self.lock = threading.Lock()
+        self.index = 0
+        self.sequence = 0
+        self.changed_at = np.zeros(pixel_count, dtype=np.int64)
+
+    def publish(self, pixels, changed=None):
+        """
+        Copy ``pixels`` into the mailbox as the newest frame.
+        :param changed: Indices of the LEDs that changed since the previous frame; computed if not given.
+        :return: The sequence number of the published frame.
+        """
+        # Write into a slot no reader can be copying: readers only copy the
+        # current slot, and only while holding the lock needed to swap it.
+        next_index = (self.index + 1) % len(self.buffers)
+        self.buffers[next_index][:] = pixels
+        if changed is None:
+            changed = np.flatnonzero(np.any(self.buffers[next_index] != self.buffers[self.index], axis=1))
+        with self.lock:
+            self.index = next_index
+            self.sequence += 1
+            self.changed_at[changed] = self.sequence
+            return self.sequence
+
+    def latest(self, since=None):
+        """
+        Get a copy of the newest frame.
+        :param since: Sequence number the caller already has; if nothing newer was published, no frame is returned.
+        :return: Tuple of (sequence, frame), frame is None if there is no (new) frame.
+        """
+        with self.lock:
+            if self.sequence == 0 or self.sequence == since:
+                return self.sequence, None
+            return self.sequence, self.buffers[self.index].copy()
+
+    def delta(self, since):
+        """
+        Get the LEDs that changed after frame ``since``.
+        :param since: Sequence number the caller already has (0 for none).
+        :return: Tuple of (sequence, indices, colors); both arrays are empty if nothing changed.
+        """
+        with self.lock:
+            indices = np.flatnonzero(self.changed_at > since)
+            return self.sequence, indices, self.buffers[self.index][indices]
@@ -0,0 +1,89 @@
+import time
+
+
+class FrameScheduler:
+    """
+    Fixed-timestep frame pacing against absolute deadlines.
+
+    Sleeping until an absolute deadline (instead of a flat ``sleep(1/fps)``)
+    keeps the frame rate independent of how long the effect and the strip
+    write took. When a frame overruns its deadline, the overrun policy decides
+    what happens to the missed frame slots:
+
+    * ``"skip"``: drop the missed slots and realign to the slot grid.
+    * ``"catch-up"``: render the missed slots back-to-back without sleeping,
+      up to ``max_catch_up`` slots, then fall back to skipping.
+    """
+    POLICIES = ("skip", "catch-up")
+
+    def __init__(self, fps=30, overrun_policy="skip", max_catch_up=3, clock=time.perf_counter, sleep=time.sleep):
+        """
+        :param fps: Target frames per second. ``None`` or 0 disables pacing.
+        :param overrun_policy: One of ``POLICIES``.
+        :param max_catch_up: Most slots the ``"catch-up"`` policy will render late.
+        :param clock: Monotonic clock returning seconds.
+        :param sleep: Sleep function taking seconds.
+        """
+        if overrun_policy not in self.POLICIES:
+            raise ValueError(f"Unknown overrun policy: {overrun_policy}")
+        self.overrun_policy = overrun_policy
+        self.max_catch_up = max_catch_up
+        self.clock = clock
+        self.sleep = sleep
+        self.set_fps(fps)
+
+        self.deadline = None
+        self.frame_count = 0
+        self.overruns = 0
+        self.dropped_frames = 0
+        self.last_slack = 0.0
+
+    def set_fps(self, fps):
+        """
+        Change the target frame rate. Takes effect from the next frame.
+        """
+        if fps is not None and fps < 0:
+            raise ValueError(f"Invalid fps: {fps}")
+        self.fps = fps or None
+        self.period = 1 / self.fps if self.fps else 0.0
+
+    def start(self):
+        """
+        Start pacing; the first frame is due one period from now.
+        """
+        self.deadline = self.clock() + self.period
+
+    def wait(self):
+        """
+        Block until the current frame's deadline and advance to the next one.
+
+        :return: Number of frame slots dropped because of an overrun.
+        """
+        if self.deadline is None:
+            self.start()
+        self.frame_count += 1
+
+        if not self.period:
+            self.last_slack = 0.0
+            return 0
+
+        now = self.clock()
+        slack = self.deadline - now
+        self.last_slack = slack
+
+        if slack >= 0:
+            self.sleep(slack)
+            self.deadline += self.period
+            return 0
+
+        self.overruns += 1
+        missed = int(-slack // self.period)
+        if self.overrun_policy == "catch-up" and missed < self.max_catch_up:
+            # Render the next frame immediately; its deadline may already be past
+            self.deadline += self.period
+            return 0
+
+        # Drop the missed slots and realign to the next slot boundary
+        self.deadline += (missed + 1) * self.period
+        self.dropped_frames += missed
+        return missed
@@ -1,8 +1,15 @@
-import matplotlib.pyplot as plt
 import threading
 import time
 import numpy as np
-from queue import Queue, Empty
+
+from controllers.command_queue import CommandQueue
+from controllers.frame_mailbox import FrameMailbox
+from controllers.frame_scheduler import FrameScheduler
+from controllers.pixel_buffer import PixelBuffer
+from controllers.render_stats import RenderStats
+from geometry.led_geometry import LEDGeometry
+from outputs.color_pipeline import ColorPipeline
+from recording.frame_recorder import FrameRecorder
 
 
 class LEDController:
@@ -10,53 +17,142 @@ class LEDController:
     Main controller class for managing LED effects and rendering.
     """
 
-    def __init__(self, coords, pixel_count, drymode):
+    def __init__(self, coords, pixel_count, drymode, fps=30, overrun_policy="skip", color_order="BRG",
+                 brightness=0.5, gamma=(1.0, 1.0, 1.0), white_balance=(1.0, 1.0, 1.0), crossfade=0.0,
+                 geometry=None):
         """
         Initialize the controller.
         :param coords: A list of 3D coordinates for each LED.
         :param pixel_count: Total number of LEDs.
+        :param fps: Target frame rate of the rendering loop.
+        :param overrun_policy: What to do with frames that miss their deadline ("skip" or "catch-up").
+        :param color_order: Channel order the strip expects; effects always write (r, g, b).
+        :param brightness: Global output brightness in [0, 1].
+        :param gamma: Output gamma per (r, g, b) channel.
+        :param white_balance: Output scale factor per (r, g, b) channel.
+        :param crossfade: Default duration in seconds of the crossfade between effects.
+        :param geometry: Precomputed LEDGeometry of ``coords``, e.g. from the coordinate store.
         """
         self.coords = coords
 
         # coords = [(0,0,0), (1,0,0), (0,1,1)]
-        self.z_values = [coord[2] for coord in coords]
-
-        self.x_values = [coord[0] for coord in coords]
-        self.y_values = [coord[1] for coord in coords]
+        # Shared, precomputed geometry handed to every effect
+        self.geometry = geometry or LEDGeometry(coords)
+        min_x, _, min_z = (float(v) for v in self.geometry.bounds_min)
+        max_x, _, max_z = (float(v) for v in self.geometry.bounds_max)
 
-        self.min_y = min(self.z_values)
-        self.max_y =  max(self.z_values)
+        # Effects treat z as the vertical axis, so the "y" bounds are the z bounds
+        self.min_y = min_z
+        self.max_y = max_z
 
-        self.min_x = min(self.x_values)
-        self.max_x =  max(self.x_values)
+        self.min_x = min_x
+        self.max_x = max_x
 
-        self.min_z = min(self.z_values)
-        self.max_z =  max(self.z_values)
+        self.min_z = min_z
+        self.max_z = max_z
 
-        self.three_d_center = (
-            sum(self.x_values) / len(coords),
-            sum(self.y_values) / len(coords),
-            sum(self.z_values) / len(coords),
-        )
+        self.three_d_center = tuple(float(v) for v in self.geometry.center)
 
         self.drymode = drymode
+        self.pixels = PixelBuffer(pixel_count, color_order)  # All LEDs start off
         if not self.drymode:
-            import neopixel
-            import board
-            self.pixels = neopixel.NeoPixel(board.D18, pixel_count, brightness=0.5, auto_write=False)
-            self.pixels.fill((0,0,0))
+            from outputs.neopixel_output import NeoPixelOutput
+            self.output = NeoPixelOutput(pixel_count)
         else:
-            self.pixels = [[0, 0, 0] for _ in range(pixel_count)]  # Initialize all LEDs to off
+            self.output = None
+        self.color_pipeline = ColorPipeline(pixel_count, brightness, gamma, white_balance)
         self.effect = None
         self.running = False
-        self.plot_queue = Queue()  # Thread-safe queue for updating plot
-
-    def set_effect(self, effect):
+        self.frames = FrameMailbox(pixel_count)  # Latest rendered frame for the visualizer and other consumers
+        self.scheduler = FrameScheduler(fps=fps, overrun_policy=overrun_policy)
+        self.stats = RenderStats()
+        self.commands = CommandQueue()  # Control commands applied between frames
+        self.force_show = True  # Show the next frame even if the pixels did not change
+        self.recorder = None
+        self.streamer = None
+
+        # Effect switches are handed to the render loop and applied between two frames
+        self.crossfade = crossfade
+        self.switch_lock = threading.Lock()
+        self.pending_switch = None
+        self.switch_ready = threading.Event()
+        self.fade_from = None
+        self.fade_start = 0.0
+        self.fade_duration = 0.0
+        self.fade_buffer = np.zeros((pixel_count, 3), dtype=np.float32)
+
+    def set_effect(self, effect, crossfade=None, requested_at=None):
         """
-        Set the current effect.
-        :param effect: An instance of the Effect subclass.
+        Set the current effect. While the render loop runs, the switch is applied at the next frame boundary.
+        :param effect: An instance of the Effect subclass, already constructed.
+        :param crossfade: Seconds to fade from the previous effect; the controller's default if None.
+        :param requested_at: ``time.perf_counter()`` when the switch was requested, to measure the switch latency.
         """
+        switch = (effect, self.crossfade if crossfade is None else crossfade, requested_at)
+        with self.switch_lock:
+            if self.running:
+                self.pending_switch = switch
+                self.switch_ready.set()
+                return
+        self._apply_switch(switch)
+
+    def _apply_switch(self, switch):
+        effect, crossfade, _ = switch
+        previous = self.effect
         self.effect = effect
+        self.stats.select(getattr(effect, "effect_selector", type(effect).__name__))
+        if crossfade > 0 and previous is not None and self.running:
+            self.fade_from = previous
+            self.fade_start = time.perf_counter()
+            self.fade_duration = crossfade
+        else:
+            self.fade_from = None
+
+    def set_brightness(self, brightness):
+        """
+        Change the global output brightness.
+        :param brightness: Brightness in [0, 1].
+        """
+        self.color_pipeline.set_brightness(brightness)
+        self.force_show = True
+
+    def start_recording(self, path, compression="none"):
+        """
+        Record every frame shown from now on into a frame recording.
+        :param path: Recording file to write.
+        :param compression: "none", "delta" or "rle".
+        """
+        self.stop_recording()
+        self.recorder = FrameRecorder(path, len(self.pixels), self.scheduler.fps,
+                                      color_order=self.pixels.color_order, compression=compression)
+        print(f"Recording to {path}")
+
+    def stop_recording(self):
+        """
+        Finish the current recording, if any.
+        """
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.close()
+            print(f"Recorded {recorder.frame_count} frames to {recorder.path}")
+
+    def start_streaming(self, streamer):
+        """
+        Send every frame shown from now on to thin clients.
+        :param streamer: FrameStreamer for ``len(self.pixels)`` LEDs.
+        """
+        self.stop_streaming()
+        self.streamer = streamer
+        print(f"Streaming frames ({streamer.compression})")
+
+    def stop_streaming(self):
+        """
+        Stop the current frame stream, if any.
+        """
+        streamer, self.streamer = self.streamer, None
+        if streamer is not None:
+            streamer.close()
+            print(f"Streamed {streamer.packets} frames")
 
     def start(self):
         """
@@ -67,29 +163,75 @@ class LEDController:
 
     def stop(self):
         """
-        Stop the rendering loop.
+        Stop the rendering loop and finish any recording or stream.
         """
         self.running = False
+        self.stop_recording()
+        self.stop_streaming()
 
     def _render_effect(self):
         """
-        Run the effect rendering loop and send updates to the plot queue.
+        Run the effect rendering loop and publish each frame to the frame mailbox.
         """
-        while self.running and self.effect:
-            self.effect.update()
-            self.render_neopixels()
-            self.plot_queue.put(self.pixels)  # Send updated pixels to the plot
-            time.sleep(1/30)  # Adjust for desired frame rate
-
-    def get_plot_data(self):
+        clock = time.perf_counter
+        self.scheduler.start()
+        while self.running:
+            self.commands.drain()
+            with self.switch_lock:
+                switch, self.pending_switch = self.pending_switch, None
+            if switch is not None:
+                self._apply_switch(switch)
+            if self.effect is None:
+                # Nothing to show yet: wake up as soon as the first effect arrives
+                self.switch_ready.wait(timeout=0.1)
+                self.switch_ready.clear()
+                self.scheduler.start()
+                continue
+
+            frame_start = clock()
+            if self.fade_from is not None:
+                self._render_crossfade(frame_start)
+            else:
+                self.effect.update()
+            update_done = clock()
+            changed = self.pixels.changed_indices()
+            if len(changed) or self.force_show:
+                self.force_show = False
+                self.render_neopixels()  # Skip the strip write if the frame is identical
+            show_done = clock()
+            if len(changed):
+                self.frames.publish(self.pixels.data, changed)  # Publish the finished frame to the visualizer
+            self.pixels.mark_flushed(changed)
+            dropped = self.scheduler.wait()  # Sleep until the next frame deadline
+            recorder = self.recorder
+            if recorder is not None:
+                recorder.write(self.pixels.data, repeat=1 + dropped)  # The frame stayed up for the dropped slots too
+            streamer = self.streamer
+            if streamer is not None:
+                streamer.write(self.pixels.data)
+            self.stats.record(update_done - frame_start, show_done - update_done, self.scheduler.last_slack, dropped,
+                              changed=bool(len(changed)))
+            if switch is not None and switch[2] is not None:
+                latency = show_done - switch[2]  # From the request until the first frame of the new effect was shown
+                self.stats.record_switch(latency)
+                print(f"Effect switch took {latency * 1000:.1f} ms")
+
+    def _render_crossfade(self, now):
         """
-        Fetch the latest LED data for plotting.
+        Render the previous and the current effect and blend them into the pixels.
         """
-        try:
-            # Non-blocking get for the latest pixel data
-            return self.plot_queue.get_nowait()
-        except Empty:
-            return None  # No new data to update
+        progress = (now - self.fade_start) / self.fade_duration
+        if progress >= 1:
+            self.fade_from = None
+            self.effect.update()
+            return
+        old, new = self.fade_from, self.effect
+        old.render(old.frame)
+        new.render(new.frame)
+        blend = self.fade_buffer
+        np.multiply(old.frame, 1 - progress, out=blend)
+        blend += new.frame * np.float32(progress)
+        self.pixels.write(blend)
 
     # Future NeoPixel integration
     def render_neopixels(self):
@@ -99,4 +241,5 @@ class LEDController:
         """
         if self.drymode:
             return
-        self.pixels.show()  # Call to update NeoPixel hardware
+        corrected = self.color_pipeline.apply(self.pixels.data)
+        self.output.show(self.pixels.device_frame(corrected))  # Bulk copy to the NeoPixel hardware
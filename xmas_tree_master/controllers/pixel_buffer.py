@@ -0,0 +1,84 @@
+import numpy as np
+
+
+class PixelBuffer:
+    """
+    Contiguous RGB pixel store backed by an ``(N, 3)`` uint8 array.
+
+    Supports per-pixel item assignment like a NeoPixel strip as well as
+    whole-array writes. Colors are stored as (r, g, b); they are reordered to
+    the strip's color order once, when the frame is flushed to the output.
+
+    Writes mark the buffer dirty; ``changed_indices`` then compares it with
+    the last flushed frame, so unchanged frames can skip the output.
+    Code writing to ``data`` directly must call ``mark_dirty``.
+    """
+
+    def __init__(self, pixel_count, color_order="BRG"):
+        """
+        :param pixel_count: Number of LEDs.
+        :param color_order: Order in which the strip driver expects the channels, e.g. "BRG".
+        """
+        if sorted(color_order) != sorted("RGB"):
+            raise ValueError(f"Invalid color order: {color_order}")
+        self.data = np.zeros((pixel_count, 3), dtype=np.uint8)
+        self.color_order = color_order
+        self.channel_order = ["RGB".index(channel) for channel in color_order]
+        self.flushed = np.zeros_like(self.data)
+        self.dirty = True
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [tuple(color) for color in self.data[index].tolist()]
+        return tuple(self.data[index].tolist())
+
+    def __setitem__(self, index, color):
+        self.data[index] = color
+        self.dirty = True
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def fill(self, color):
+        self.data[:] = color
+        self.dirty = True
+
+    def write(self, frame):
+        """
+        Replace the whole buffer with an ``(N, 3)`` RGB frame.
+        """
+        np.copyto(self.data, frame, casting="unsafe")
+        self.dirty = True
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def changed_indices(self):
+        """
+        Indices of the pixels that changed since the last flush.
+        """
+        if not self.dirty:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(np.any(self.data != self.flushed, axis=1))
+
+    def mark_flushed(self, changed=None):
+        """
+        Record the current frame as flushed.
+        :param changed: Result of ``changed_indices``, to only copy the changed pixels.
+        """
+        if changed is None:
+            self.flushed[:] = self.data
+        else:
+            self.flushed[changed] = self.data[changed]
+        self.dirty = False
+
+    def device_frame(self, frame=None):
+        """
+        Return the frame (by default this buffer's) reordered to the strip's color order.
+        """
+        if frame is None:
+            frame = self.data
+        return frame[:, self.channel_order]
@@ -0,0 +1,163 @@
+import time
+from bisect import bisect_left
+
+
+class RollingHistogram:
+    """
+    Histogram over the last ``window`` samples with fixed buckets.
+
+    All storage is preallocated, so recording a sample does not allocate.
+    Percentiles are reported as the upper edge of the matching bucket; samples
+    above the last edge are reported as the last edge.
+    """
+
+    def __init__(self, edges, window=300):
+        """
+        :param edges: Ascending upper bucket edges. Larger values land in a final overflow bucket.
+        :param window: Number of most recent samples kept.
+        """
+        self.edges = list(edges)
+        self.counts = [0] * (len(self.edges) + 1)
+        self.samples = [-1] * window
+        self.position = 0
+
+    def record(self, value):
+        bucket = bisect_left(self.edges, value)
+        evicted = self.samples[self.position]
+        if evicted >= 0:
+            self.counts[evicted] -= 1
+        self.counts[bucket] += 1
+        self.samples[self.position] = bucket
+        self.position = (self.position + 1) % len(self.samples)
+
+    def percentile(self, p):
+        """
+        Return the upper bucket edge below which ``p`` percent of the samples fall, or None if empty.
+        """
+        total = sum(self.counts)
+        if not total:
+            return None
+        threshold = total * p / 100
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= threshold:
+                break
+        return self.edges[min(bucket, len(self.edges) - 1)]
+
+    def summary(self, scale=1):
+        percentiles = {}
+        for p in (50, 95, 99):
+            value = self.percentile(p)
+            percentiles[f"p{p}"] = None if value is None else round(value * scale, 3)
+        return percentiles
+
+
+# Log-spaced time buckets from 10 µs to ~1 s, in seconds
+TIME_EDGES = [1e-5 * 1.25 ** i for i in range(52)]
+# Dropped frame slots per frame
+DROP_EDGES = [0, 1, 2, 3, 5, 10, 30]
+
+
+class EffectStats:
+    """
+    Rolling frame timings for a single effect.
+    """
+
+    def __init__(self, window):
+        self.update = RollingHistogram(TIME_EDGES, window)
+        self.show = RollingHistogram(TIME_EDGES, window)
+        self.slack = RollingHistogram(TIME_EDGES, window)
+        self.dropped = RollingHistogram(DROP_EDGES, window)
+        self.frames = 0
+        self.unchanged = 0
+        self.overruns = 0
+        self.dropped_total = 0
+
+    def summary(self):
+        return {
+            "frames": self.frames,
+            "unchanged": self.unchanged,
+            "overruns": self.overruns,
+            "dropped_total": self.dropped_total,
+            "update_ms": self.update.summary(1000),
+            "show_ms": self.show.summary(1000),
+            "slack_ms": self.slack.summary(1000),
+            "dropped": self.dropped.summary(),
+        }
+
+
+class RenderStats:
+    """
+    Per-frame performance telemetry of the render loop, kept per active effect.
+    """
+
+    def __init__(self, window=300, clock=time.perf_counter):
+        """
+        :param window: Number of most recent frames the percentiles cover.
+        :param clock: Clock used to measure the achieved frame rate.
+        """
+        self.window = window
+        self.clock = clock
+        self.effects = {}
+        self.active_name = None
+        self.active = None
+        self.window_start = clock()
+        self.window_frames = 0
+        self.switch = RollingHistogram(TIME_EDGES, window=50)
+        self.last_switch = None
+
+    def select(self, effect_name):
+        """
+        Make ``effect_name`` the effect that subsequent frames are recorded for.
+        """
+        if effect_name not in self.effects:
+            self.effects[effect_name] = EffectStats(self.window)
+        self.active_name = effect_name
+        self.active = self.effects[effect_name]
+
+    def record(self, update_time, show_time, slack, dropped, changed=True):
+        """
+        Record one frame. Times are in seconds; a negative slack is an overrun.
+        :param changed: False if the frame was identical to the previous one and not shown.
+        """
+        stats = self.active
+        if stats is None:
+            return
+        stats.frames += 1
+        if not changed:
+            stats.unchanged += 1
+        stats.update.record(update_time)
+        stats.show.record(show_time)
+        if slack < 0:
+            stats.overruns += 1
+            slack = 0.0
+        stats.slack.record(slack)
+        stats.dropped.record(dropped)
+        stats.dropped_total += dropped
+        self.window_frames += 1
+
+    def record_switch(self, latency):
+        """
+        Record the latency of an effect switch, from the request until its first frame was shown.
+        """
+        self.switch.record(latency)
+        self.last_switch = latency
+
+    def summary(self):
+        """
+        Compact summary of the active effect since the previous summary.
+        """
+        now = self.clock()
+        elapsed = now - self.window_start
+        fps = self.window_frames / elapsed if elapsed > 0 else 0.0
+        self.window_start = now
+        self.window_frames = 0
+
+        data = {"effect": self.active_name, "fps": round(fps, 1)}
+        if self.last_switch is not None:
+            data["switch_ms"] = self.switch.summary(1000)
+            data["switch_ms"]["last"] = round(self.last_switch * 1000, 3)
+        if self.active is not None:
+            data.update(self.active.summary())
+        return data
@@ -1,9 +1,11 @@
 from registry.effect_registry import EffectRegistry
+from schemas.config_schema import ConfigSchema
 
 
 def RegisterEffect():
     """
     Decorator to register an effect with a unique selector.
+    Compiles the effect's config schema from its default_config and parameters.
     """
     def decorator(effect_class):
         if not hasattr(effect_class, "effect_selector"):
@@ -11,6 +13,8 @@ def RegisterEffect():
 
         print(f"Registering effect: {effect_class.effect_selector}")
 
+        effect_class.config_schema = ConfigSchema(effect_class.default_config, effect_class.parameters)
+
         EffectRegistry.register(effect_class.effect_selector, effect_class)
         return effect_class
 
@@ -4,13 +4,12 @@ import random
 import numpy as np
 from decoratos.register_effect import RegisterEffect
 from abstracts.effect import Effect
+from schemas.config_schema import Parameter
 
-from utils.get_tuple_from_json_array import get_tuple_from_json_array
-
-from utils.apply_brg import apply_brg
+from utils.scale_color import scale_color_array
 
 """
-LEDs are BRG Ordered. Colors have to be set like x = (b, r, g). The update method gets called once per rendering frame.
+Colors are set as (r, g, b); they are reordered to the LEDs' BRG order on output. The render method gets called once per rendering frame.
 """
 @RegisterEffect()
 class BreathingSphereEffect(Effect):
@@ -22,19 +21,26 @@ class BreathingSphereEffect(Effect):
         "speed": 0.05,
         "color": (0, 0, 255),
     }
+    parameters = {
+        "speed": Parameter("float", 0.001, 1),
+        "color": Parameter("color"),
+    }
     name = "Breathing Sphere"
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.speed = self.get_config('speed', float)
-        self.color = self.get_config('color', get_tuple_from_json_array)
+        self.speed = self.get_config('speed')
+        self.color = self.get_config('color')
         self.brightness = 0
         self.direction = 1
 
-    def update(self):
+    def cycle_frames(self):
+        # Up to full brightness and back down
+        return 2 * math.ceil(1 / self.speed)
+
+    def render(self, frame):
         self.brightness += self.speed * self.direction
         if self.brightness >= 1 or self.brightness <= 0:
             self.direction *= -1
-        for i, _ in enumerate(self.coords):
-            self.pixels[i] = apply_brg(self.color, abs(self.brightness))
+        frame[:] = scale_color_array(self.color, [abs(self.brightness)])
 
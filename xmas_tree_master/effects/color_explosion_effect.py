@@ -4,13 +4,12 @@ import random
 import numpy as np
 from decoratos.register_effect import RegisterEffect
 from abstracts.effect import Effect
+from schemas.config_schema import Parameter
 
-from utils.get_tuple_from_json_array import get_tuple_from_json_array
-
-from utils.apply_brg import apply_brg
+from utils.scale_color import scale_color_array
 
 """
-LEDs are BRG Ordered. Colors have to be set like x = (b, r, g). The update method gets called once per rendering frame.
+Colors are set as (r, g, b); they are reordered to the LEDs' BRG order on output. The render method gets called once per rendering frame.
 """
 @RegisterEffect()
 class ColorExplosionEffect(Effect):
@@ -22,22 +21,28 @@ class ColorExplosionEffect(Effect):
         "speed": 2,
         "base_color": (255, 0, 255),
     }
+    parameters = {
+        "speed": Parameter("float", 0.01, 50),
+        "base_color": Parameter("color"),
+    }
     name = "Color Explosion"
 
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.speed = self.get_config('speed', float)
-        self.base_color = self.get_config('base_color', get_tuple_from_json_array)
+        self.speed = self.get_config('speed')
+        self.base_color = self.get_config('base_color')
         self.explosion_radius = 0
 
-    def update(self):
+    def render(self, frame):
         self.explosion_radius += self.speed
         if self.explosion_radius > max(self.max_x, self.max_y, self.max_z):
             self.explosion_radius = 0
 
-        for i, coord in enumerate(self.coords):
-            distance = math.sqrt(coord[0]**2 + coord[1]**2 + coord[2]**2)
-            brightness = max(0, 1 - abs(distance - self.explosion_radius) / 10)
-            self.pixels[i] = apply_brg(self.base_color, brightness)
+        # Only LEDs within 10 units of the explosion front are lit
+        lit, distance = self.geometry.spatial_index.within_shell((0, 0, 0), self.explosion_radius - 10,
+                                                                 self.explosion_radius + 10, return_distance=True)
+        brightness = np.maximum(0, 1 - np.abs(distance - self.explosion_radius) / 10)
+        frame[:] = 0
+        frame[lit] = scale_color_array(self.base_color, brightness)
 
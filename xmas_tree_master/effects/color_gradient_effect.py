@@ -1,6 +1,12 @@
+import math
+
+import numpy as np
+
 from abstracts.effect import Effect
-import colorsys
+from schemas.config_schema import Parameter
 from decoratos.register_effect import RegisterEffect
+from geometry.slab_index import BandPainter
+from utils.hsv_to_rgb import hsv_to_rgb_array
 
 
 @RegisterEffect()
@@ -14,35 +20,68 @@ class ColorGradientSweepEffect(Effect):
         "speed": 1,
         "plane_height": 5,
     }
+    parameters = {
+        "speed": Parameter("float", 0.01, 50),
+        "plane_height": Parameter("float", 0.1, 200),
+    }
     name = "Color Gradient"
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.plane_height = self.get_config('plane_height', float)
-        self.speed = self.get_config('speed', float)
+        self.plane_height = self.get_config('plane_height')
+        self.speed = self.get_config('speed')
 
-        # Initialize plane position and direction
-        self.plane_pos = self.min_y - self.plane_height / 2
+        # The plane moves in whole steps of `speed` from just below the tree
+        self.start_pos = self.min_y - self.plane_height / 2
+        self.bottom_step, self.top_step = self.get_turning_steps()
+        # Start at the bottom turn, from where every pass up and down is the same
+        self.step = self.bottom_step
+        self.plane_pos = self.start_pos + self.step * self.speed
         self.plane_direction = 1
 
-    def get_gradient_color(self, coord_z):
+        # The gradient only depends on Z, so it is computed once
+        self.gradient_colors = self.get_gradient_colors(self.geometry.z)
+        self.painter = BandPainter()
+
+    def config_changed(self, previous):
+        # Lay the steps of the new speed through the current position, so the plane does not jump
+        position = self.plane_pos
+        self.step = math.ceil((position - (self.min_y - self.plane_height / 2)) / self.speed)
+        self.start_pos = position - self.step * self.speed
+        self.bottom_step, self.top_step = self.get_turning_steps()
+        self.gradient_colors = self.get_gradient_colors(self.geometry.z)
+
+    def get_gradient_colors(self, coord_z):
         """
-        Returns a gradient color based on the Z-coordinate.
-        Maps Z to a hue (0-360) and converts it to RGB.
+        Returns gradient colors based on the Z-coordinates.
+        Maps Z to a hue (0-1) and converts it to RGB.
         """
-        hue = (coord_z - self.min_y) / (self.max_y - self.min_y) * 360  # Map Z to 0-360 hue
-        r, g, b = colorsys.hsv_to_rgb(hue / 360, 1, 1)  # HSV to RGB
-        return int(r * 255), int(g * 255), int(b * 255)
+        hue = (coord_z - self.min_y) / (self.max_y - self.min_y)  # Map Z to 0-1 hue
+        return (hsv_to_rgb_array(hue, 1, 1) * 255).astype(np.uint8)
+
+    def get_turning_steps(self):
+        """
+        Returns the steps at which the plane turns around: the last one past
+        the bottom and the first one past the top of the tree.
+        """
+        steps = np.arange(math.ceil((self.max_y - self.min_y) / self.speed) + 2)
+        positions = self.start_pos + steps * self.speed
+        below = positions - self.plane_height / 2 < self.min_y
+        above = positions + self.plane_height / 2 > self.max_y
+        return int(np.count_nonzero(below)) - 1, int(np.argmax(above))
+
+    def cycle_frames(self):
+        # Up the tree and back down, between the two turns
+        return 2 * max(self.top_step - self.bottom_step, 1)
 
-    def update(self):
+    def render(self, frame):
         """
         Updates the LED colors based on the moving plane position.
         """
-        for i, coord in enumerate(self.coords):
-            if self.plane_pos - self.plane_height / 2 <= coord[2] <= self.plane_pos + self.plane_height / 2:
-                self.pixels[i] = self.get_gradient_color(coord[2])
-            else:
-                self.pixels[i] = (0, 0, 0)  # Turn off LEDs outside the plane
+        self.painter.begin(frame)  # Turn off LEDs that left the plane
+        in_plane = self.geometry.slabs[2].band(self.plane_pos - self.plane_height / 2,
+                                               self.plane_pos + self.plane_height / 2)
+        self.painter.paint(frame, in_plane, self.gradient_colors[in_plane])
 
         # Reverse direction if the plane hits the boundaries
         if self.plane_pos - self.plane_height / 2 < self.min_y and self.plane_direction == -1:
@@ -51,4 +90,5 @@ class ColorGradientSweepEffect(Effect):
             self.plane_direction = -1
 
         # Move the plane
-        self.plane_pos += self.plane_direction * self.speed
+        self.step += self.plane_direction
+        self.plane_pos = self.start_pos + self.step * self.speed
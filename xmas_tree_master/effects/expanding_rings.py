@@ -1,8 +1,8 @@
 import math
 
 from abstracts.effect import Effect
+from schemas.config_schema import Parameter
 from decoratos.register_effect import RegisterEffect
-from utils.get_tuple_from_json_array import get_tuple_from_json_array
 
 
 @RegisterEffect()
@@ -17,23 +17,32 @@ class ExpandingRingsEffect(Effect):
         "max_radius": 100,
         "color": (255, 255, 0),
     }
+    parameters = {
+        "speed": Parameter("float", 0.01, 50),
+        "max_radius": Parameter("float", 1, 1000),
+        "color": Parameter("color"),
+    }
 
     def __init__(self, **kwargs):
         super().__init__( **kwargs)
 
         self.radius = 0
         self.radius_direction = 1
-        self.speed = self.get_config('speed', float)
-        self.max_radius = self.get_config('max_radius', float)
-        self.color = self.get_config('color', get_tuple_from_json_array)
-
-    def update(self):
-        for i, coord in enumerate(self.coords):
-            distance = math.sqrt((coord[0] - self.center[0])**2 + (coord[2] - self.center[2])**2)
-            if abs(distance - self.radius) <= self.max_radius / 10:  # Allow a small thickness for the ring
-                self.pixels[i] = self.color
-            else:
-                self.pixels[i] = (0, 0, 0)
+        self.speed = self.get_config('speed')
+        self.max_radius = self.get_config('max_radius')
+        self.color = self.get_config('color')
+
+    def cycle_frames(self):
+        # Out to max_radius and back
+        return 2 * math.ceil(self.max_radius / self.speed)
+
+    def render(self, frame):
+        thickness = self.max_radius / 10  # Allow a small thickness for the ring
+        # Rings expand in the XZ plane around the center
+        on_ring = self.geometry.spatial_index.within_shell(self.center, self.radius - thickness,
+                                                           self.radius + thickness, axes=(0, 2))
+        frame[:] = 0
+        frame[on_ring] = self.color
 
         if self.radius >= self.max_radius and self.radius_direction == 1:
             self.radius_direction = -1
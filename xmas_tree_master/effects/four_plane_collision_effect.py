@@ -1,6 +1,7 @@
 from abstracts.effect import Effect
+from schemas.config_schema import Parameter
 
-from utils.get_tuple_from_json_array import get_tuple_from_json_array
+from geometry.slab_index import BandPainter
 
 from decoratos.register_effect import RegisterEffect
 
@@ -19,17 +20,25 @@ class FourPlaneCollisionEffect(Effect):
         "color_3": (255, 0,255),
         "color_4": (0, 0, 255),
     }
+    parameters = {
+        "speed": Parameter("float", 0.01, 50),
+        "plane_height": Parameter("float", 0.1, 200),
+        "color_1": Parameter("color"),
+        "color_2": Parameter("color"),
+        "color_3": Parameter("color"),
+        "color_4": Parameter("color"),
+    }
 
     name = "Four Plane Collision"
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.speed = self.get_config('speed', float)
-        self.plane_height = self.get_config('plane_height', float)
-        self.color_1 = self.get_config('color_1', get_tuple_from_json_array)
-        self.color_2 = self.get_config('color_2', get_tuple_from_json_array)
-        self.color_3 = self.get_config('color_3', get_tuple_from_json_array)
-        self.color_4 = self.get_config('color_4', get_tuple_from_json_array)
+        self.speed = self.get_config('speed')
+        self.plane_height = self.get_config('plane_height')
+        self.color_1 = self.get_config('color_1')
+        self.color_2 = self.get_config('color_2')
+        self.color_3 = self.get_config('color_3')
+        self.color_4 = self.get_config('color_4')
 
         # Initialize plane positions and directions
         self.planes = [
@@ -38,14 +47,18 @@ class FourPlaneCollisionEffect(Effect):
             {"pos": self.min_x - self.plane_height / 2, "direction": 1, "axis": "x", "color": self.color_3},
             {"pos": self.max_x + self.plane_height / 2, "direction": -1, "axis": "x", "color": self.color_4},
         ]
+        self.painter = BandPainter()
+
+    def config_changed(self, previous):
+        for plane, color in zip(self.planes, (self.color_1, self.color_2, self.color_3, self.color_4)):
+            plane["color"] = color
 
-    def update(self):
-        for i, coord in enumerate(self.coords):
-            self.pixels[i] = (0, 0, 0)  # Default to off
-            for plane in self.planes:
-                axis_value = coord[0] if plane["axis"] == "x" else coord[2]
-                if plane["pos"] - self.plane_height / 2 <= axis_value <= plane["pos"] + self.plane_height / 2:
-                    self.pixels[i] = plane["color"]
+    def render(self, frame):
+        self.painter.begin(frame)  # Default to off
+        for plane in self.planes:
+            slab = self.geometry.slabs[0] if plane["axis"] == "x" else self.geometry.slabs[2]
+            in_plane = slab.band(plane["pos"] - self.plane_height / 2, plane["pos"] + self.plane_height / 2)
+            self.painter.paint(frame, in_plane, plane["color"])
 
         for plane in self.planes:
             if plane["axis"] == "y":
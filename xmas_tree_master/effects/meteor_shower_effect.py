@@ -1,16 +1,11 @@
-import math
-import random
-
 import numpy as np
 from decoratos.register_effect import RegisterEffect
 from abstracts.effect import Effect
-
-from utils.get_tuple_from_json_array import get_tuple_from_json_array
-
-from utils.apply_brg import apply_brg
+from schemas.config_schema import Parameter
+from particles.particle_system import ParticleSystem
 
 """
-LEDs are BRG Ordered. Colors have to be set like x = (b, r, g). The update method gets called once per rendering frame.
+Colors are set as (r, g, b); they are reordered to the LEDs' BRG order on output. The render method gets called once per rendering frame.
 """
 @RegisterEffect()
 class MeteorShowerEffect(Effect):
@@ -22,34 +17,59 @@ class MeteorShowerEffect(Effect):
         "speed": 2,
         "trail_length": 10,
         "color": (0, 255, 255),
+        "max_meteors": 10,
+        "spawn_rate": 0.3,
+        "tail_length": 0,
+    }
+    parameters = {
+        "speed": Parameter("float", 0.01, 50),
+        "trail_length": Parameter("int", 1, 100),
+        "color": Parameter("color"),
+        "max_meteors": Parameter("int", 1, 1000),
+        "spawn_rate": Parameter("float", 0, 50),
+        "tail_length": Parameter("float", 0, 200),
     }
     name = "Meteor Shower"
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.speed = self.get_config('speed', float)
-        self.trail_length = self.get_config('trail_length', int)
-        self.color = self.get_config('color', get_tuple_from_json_array)
-        self.meteors = []
-
-    def update(self):
-        for meteor in self.meteors:
-            meteor["z"] -= self.speed
+        self.speed = self.get_config('speed')
+        self.trail_length = self.get_config('trail_length')
+        self.color = self.get_config('color')
+        self.max_meteors = self.get_config('max_meteors')
+        self.spawn_rate = self.get_config('spawn_rate')
+        self.tail_length = self.get_config('tail_length')
+        self.meteors = ParticleSystem(self.geometry, capacity=self.max_meteors)
 
-        self.meteors = [m for m in self.meteors if m["z"] > self.min_z]
+    def config_changed(self, previous):
+        # Falling meteors take on the new look right away
+        meteors = self.meteors
+        if "max_meteors" in previous:
+            meteors.resize(self.max_meteors)
+        if "speed" in previous:
+            meteors.velocity[meteors.alive] = (0, 0, -self.speed)
+        if "color" in previous:
+            meteors.color[meteors.alive] = self.color
+        if "trail_length" in previous:
+            meteors.radius[meteors.alive] = self.trail_length
+        if "tail_length" in previous:
+            meteors.trail[meteors.alive] = self.tail_length
 
-        if len(self.meteors) < 10 and random.random() > 0.7:
-            self.meteors.append({"x": random.uniform(self.min_x, self.max_x),
-                                 "y": random.uniform(self.min_y, self.max_y),
-                                 "z": self.max_z})
+    def render(self, frame):
+        self.meteors.advance()
+        self.meteors.cull(lower=(-np.inf, -np.inf, self.min_z))
 
-        for i, coord in enumerate(self.coords):
-            self.pixels[i] = (0, 0, 0)
-            for meteor in self.meteors:
-                dist = math.sqrt((coord[0] - meteor["x"])**2 +
-                                 (coord[1] - meteor["y"])**2 +
-                                 (coord[2] - meteor["z"])**2)
-                if dist < self.trail_length:
-                    brightness = max(0, 1 - (dist / self.trail_length))
-                    self.pixels[i] = apply_brg(self.color, brightness)
+        # On average spawn_rate new meteors per frame, at random spots on top of the tree
+        spawn_count = min(np.random.poisson(self.spawn_rate), self.max_meteors - len(self.meteors))
+        if spawn_count > 0:
+            low, high = self.geometry.bounds_min, self.geometry.bounds_max
+            positions = np.column_stack((
+                np.random.uniform(low[0], high[0], spawn_count),
+                np.random.uniform(low[1], high[1], spawn_count),
+                np.full(spawn_count, self.max_z),
+            ))
+            self.meteors.spawn(positions, velocity=(0, 0, -self.speed), color=self.color,
+                               radius=self.trail_length, trail=self.tail_length)
 
+        frame[:] = 0
+        self.meteors.render(frame, blend="max")
@@ -1,10 +1,11 @@
+import math
+
 from abstracts.effect import Effect
+from schemas.config_schema import Parameter
 from decoratos.register_effect import RegisterEffect
 
-from utils.get_tuple_from_json_array import get_tuple_from_json_array
-
 """
-LEDs are BRG Ordered. Colors have to be set like x = (b, r, g). The update method gets called once per rendering frame.
+Colors are set as (r, g, b); they are reordered to the LEDs' BRG order on output. The render method gets called once per rendering frame.
 """
 
 @RegisterEffect()
@@ -20,22 +21,45 @@ class PlaneSweepEffect(Effect):
         "speed": 0.1,
         "color": (0, 255, 0),
     }
+    parameters = {
+        "speed": Parameter("float", 0.001, 50),
+        "color": Parameter("color"),
+    }
     def __init__(self,  **kwargs):
         super().__init__( **kwargs)
         self.plane_height = 0
-        self.speed = self.get_config('speed', float)
-        self.color = self.get_config('color', get_tuple_from_json_array)
+        self.speed = self.get_config('speed')
+        self.color = self.get_config('color')
+
+        # LEDs sorted by height; the lit LEDs are always the first lit_count of them
+        self.slab = self.geometry.slabs[2]
+        self.lit_count = 0
+        self.last_frame = None
+
+
+    def cycle_frames(self):
+        # The plane rises from 0 until it passes the top, then starts over
+        return max(1, math.floor(self.geometry.bounds_max[2] / self.speed) + 1)
+
+    def config_changed(self, previous):
+        if "color" in previous:
+            self.last_frame = None  # Repaint the whole lit band in the new color on the next frame
 
+    def render(self, frame):
+        if frame is not self.last_frame:
+            frame[:] = 0
+            self.lit_count = 0
+            self.last_frame = frame
 
-    def update(self):
-        for i, coord in enumerate(self.coords):
-            # Check if the LED is below the current plane height
-            if coord[2] <= self.plane_height:
-                self.pixels[i] = self.color  # Set to target color
-            else:
-                self.pixels[i] = (0, 0, 0)  # Reset LEDs above the plane
+        # Light the LEDs the plane passed since the last frame, reset the ones above it
+        _, lit_count = self.slab.band_range(float("-inf"), self.plane_height)
+        if lit_count > self.lit_count:
+            frame[self.slab.order[self.lit_count:lit_count]] = self.color
+        else:
+            frame[self.slab.order[lit_count:self.lit_count]] = 0
+        self.lit_count = lit_count
 
         # Increment the plane height and loop back if it exceeds the bounds
         self.plane_height += self.speed
-        if self.plane_height > max(coord[2] for coord in self.coords):
+        if self.plane_height > self.geometry.bounds_max[2]:
             self.plane_height = 0
@@ -1,10 +1,9 @@
-import math
+import numpy as np
 
 from abstracts.effect import Effect
+from schemas.config_schema import Parameter
 from decoratos.register_effect import RegisterEffect
-import json
-
-from utils.get_tuple_from_json_array import get_tuple_from_json_array
+from geometry.slab_index import BandPainter, SlabIndex
 
 
 @RegisterEffect()
@@ -21,28 +20,43 @@ class PlainRippleEffect(Effect):
         "amplitude": 5,
         "color": (255, 255, 0),
     }
+    parameters = {
+        "speed": Parameter("float", 0.01, 50),
+        "plane_height": Parameter("float", 0.1, 200),
+        "frequency": Parameter("float", 0, 10),
+        "amplitude": Parameter("float", 0, 200),
+        "color": Parameter("color"),
+    }
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.speed = self.get_config('speed', float)
-        self.plane_height = self.get_config('plane_height', float)
-        self.frequency = self.get_config('frequency', float)
-        self.amplitude = self.get_config('amplitude', float)
-        self.color = self.get_config('color', get_tuple_from_json_array)
+        self.speed = self.get_config('speed')
+        self.plane_height = self.get_config('plane_height')
+        self.frequency = self.get_config('frequency')
+        self.amplitude = self.get_config('amplitude')
+        self.color = self.get_config('color')
 
         self.plane_pos = self.min_y - self.plane_height / 2
         self.plane_direction = 1
 
+        # The wave offset only depends on X, so it is computed once
+        self.wave_heights = self.get_wave_height(self.geometry.x)
+        # LEDs sorted by their height above the wave, so the plane is a band lookup
+        self.slab = SlabIndex(self.geometry.z - self.wave_heights)
+        self.painter = BandPainter()
+
+    def config_changed(self, previous):
+        if "frequency" in previous or "amplitude" in previous:
+            self.wave_heights = self.get_wave_height(self.geometry.x)
+            self.slab = SlabIndex(self.geometry.z - self.wave_heights)
+
     def get_wave_height(self, x):
-        """Calculates the Y-offset for the wave based on X-coordinate."""
-        return self.amplitude * math.sin(self.frequency * x)
-
-    def update(self):
-        for i, coord in enumerate(self.coords):
-            wave_height = self.get_wave_height(coord[0])
-            if self.plane_pos - self.plane_height / 2 + wave_height <= coord[2] <= self.plane_pos + self.plane_height / 2 + wave_height:
-                self.pixels[i] = self.color
-            else:
-                self.pixels[i] = (0, 0, 0)
+        """Calculates the Y-offset for the wave based on X-coordinates."""
+        return self.amplitude * np.sin(self.frequency * x)
+
+    def render(self, frame):
+        self.painter.begin(frame)
+        in_plane = self.slab.band(self.plane_pos - self.plane_height / 2, self.plane_pos + self.plane_height / 2)
+        self.painter.paint(frame, in_plane, self.color)
 
         if self.plane_pos - self.plane_height / 2 < self.min_y and self.plane_direction == -1:
             self.plane_direction = 1
@@ -0,0 +1,64 @@
+import time
+
+from decoratos.register_effect import RegisterEffect
+from abstracts.effect import Effect
+from schemas.config_schema import Parameter
+from recording.frame_player import FramePlayer
+
+"""
+Plays a frame recording instead of running effect code. Frames go through the normal output path, so the current brightness and gamma apply.
+"""
+@RegisterEffect()
+class PlaybackEffect(Effect):
+    """
+    Replays a recording made with the frame recorder, seeking by wall-clock time.
+    """
+    effect_selector = 'playback'
+    default_config = {
+        "file": "recordings/show.rec",
+        "speed": 1.0,
+        "loop": True,
+    }
+    parameters = {
+        "file": Parameter("string"),
+        "speed": Parameter("float", 0.01, 100),
+        "loop": Parameter("bool"),
+    }
+    name = "Playback"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.file = self.get_config('file')
+        self.speed = self.get_config('speed')
+        self.loop = self.get_config('loop')
+        self.player = self.open_player(self.file)
+        self.start_time = None
+
+    def open_player(self, file):
+        player = FramePlayer(file)
+        if player.led_count != self.geometry.count:
+            raise ValueError(f"Recording {file} has {player.led_count} LEDs, the tree has {self.geometry.count}")
+        if not len(player):
+            raise ValueError(f"Recording {file} is empty")
+        return player
+
+    def config_changed(self, previous):
+        if "file" in previous:
+            player = self.open_player(self.file)
+            self.player.close()
+            self.player = player
+            self.start_time = None
+        elif "speed" in previous and self.start_time is not None and self.speed:
+            # Continue from the current position at the new speed
+            now = time.perf_counter()
+            position = (now - self.start_time) * previous["speed"]
+            self.start_time = now - position / self.speed
+
+    def warm_up(self):
+        pass  # Frames are read from the recording; the clock starts with the first live frame
+
+    def render(self, frame):
+        now = time.perf_counter()
+        if self.start_time is None:
+            self.start_time = now
+        frame[:] = self.player.read_at((now - self.start_time) * self.speed, loop=self.loop)
@@ -1,10 +1,10 @@
 from abstracts.effect import Effect
-import random
+import numpy as np
 
 from decoratos.register_effect import RegisterEffect
 
 """
-LEDs are BRG Ordered. Colors have to be set like x = (b, r, g). The update method gets called once per rendering frame.
+Colors are set as (r, g, b); they are reordered to the LEDs' BRG order on output. The render method gets called once per rendering frame.
 """
 @RegisterEffect()
 class RandomEffect(Effect):
@@ -12,11 +12,11 @@ class RandomEffect(Effect):
     Random effect that cycles through predefined colors.
     """
     effect_selector = 'random'
-    default_config = None
+    default_config = {}
     name = "Random"
     def __init__(self,  **kwargs):
         super().__init__( **kwargs)
-        self.colors = [
+        self.colors = np.array([
             (0, 255, 0),   # Green
             (255, 0, 0),   # Red
             (0, 0, 255),   # Blue
@@ -25,12 +25,12 @@ class RandomEffect(Effect):
             (255, 0, 255), # Magenta
             (255, 255, 255), # White
             (128, 128, 128), # Gray
-        ]
-        self.current_colors = [random.choice(self.colors) for _ in range(len(self.pixels))]
+        ], dtype=np.uint8)
+        # Index into self.colors for every LED
+        self.current_colors = np.random.randint(len(self.colors), size=self.geometry.count)
 
-    def update(self):
-        for i in range(len(self.pixels)):
-            # Randomly cycle to a new color from the predefined list
-            if random.random() < 0.1:  # Adjust probability as needed
-                self.current_colors[i] = random.choice(self.colors)
-            self.pixels[i] = self.current_colors[i]
+    def render(self, frame):
+        # Randomly cycle to a new color from the predefined list
+        cycle = np.random.random(len(self.current_colors)) < 0.1  # Adjust probability as needed
+        self.current_colors[cycle] = np.random.randint(len(self.colors), size=int(cycle.sum()))
+        frame[:] = self.colors[self.current_colors]
@@ -3,13 +3,12 @@ import math
 import numpy as np
 from decoratos.register_effect import RegisterEffect
 from abstracts.effect import Effect
+from schemas.config_schema import Parameter
 
-from utils.get_tuple_from_json_array import get_tuple_from_json_array
-
-from utils.apply_brg import apply_brg
+from utils.scale_color import scale_color_array
 
 """
-LEDs are BRG Ordered. Colors have to be set like x = (b, r, g). The update method gets called once per rendering frame.
+Colors are set as (r, g, b); they are reordered to the LEDs' BRG order on output. The render method gets called once per rendering frame.
 """
 @RegisterEffect()
 class SpiralTwirlEffect(Effect):
@@ -23,19 +22,26 @@ class SpiralTwirlEffect(Effect):
         "radius": 0.5,
         "color": (255, 0, 0),
     }
+    parameters = {
+        "speed": Parameter("float", 0, 50),
+        "hue_shift": Parameter("float", 0, 1),
+        "radius": Parameter("float", 0, 100),
+        "color": Parameter("color"),
+    }
     name = "Spiral Twirl"
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.speed = self.get_config('speed', float)
-        self.hue_shift = self.get_config('hue_shift', float)
-        self.radius = self.get_config('radius', float)
-        self.color = self.get_config('color', get_tuple_from_json_array)
+        self.speed = self.get_config('speed')
+        self.hue_shift = self.get_config('hue_shift')
+        self.radius = self.get_config('radius')
+        self.color = self.get_config('color')
         self.angle_offset = 0
 
-    def update(self):
+    def cycle_frames(self):
+        # The output does not depend on the angle offset, so every frame is the same
+        return 1
+
+    def render(self, frame):
         self.angle_offset += self.speed
-        for i, coord in enumerate(self.coords):
-            angle = math.atan2(coord[1], coord[0]) + self.angle_offset
-            distance = math.sqrt(coord[0]**2 + coord[1]**2)
-            brightness = max(0, 1 - abs(distance - self.radius))
-            self.pixels[i] = apply_brg(self.color, brightness)
+        brightness = np.maximum(0, 1 - np.abs(self.geometry.cyl_radius - self.radius))
+        frame[:] = scale_color_array(self.color, brightness)
@@ -1,7 +1,10 @@
 import random
-import colorsys
+
+import numpy as np
 from decoratos.register_effect import RegisterEffect
 from abstracts.effect import Effect
+from schemas.config_schema import Parameter
+from utils.hsv_to_rgb import hsv_to_rgb_array
 
 @RegisterEffect()
 class TwinklingSparkleEffect(Effect):
@@ -15,12 +18,17 @@ class TwinklingSparkleEffect(Effect):
         "pulse_speed": 0.1,
         "gradient_speed": 0.02,
     }
+    parameters = {
+        "sparkle_chance": Parameter("float", 0, 1),
+        "pulse_speed": Parameter("float", 0, 1),
+        "gradient_speed": Parameter("float", 0, 1),
+    }
     name = "Sparkle"
     def __init__(self,  **kwargs):
         super().__init__( **kwargs)
-        self.sparkle_chance = float(self.config.get('sparkle_chance', self.default_config['sparkle_chance']))
-        self.pulse_speed = float(self.config.get('pulse_speed', self.default_config['pulse_speed']))
-        self.gradient_speed = float(self.config.get('gradient_speed', self.default_config['gradient_speed']))
+        self.sparkle_chance = self.get_config('sparkle_chance')
+        self.pulse_speed = self.get_config('pulse_speed')
+        self.gradient_speed = self.get_config('gradient_speed')
 
         self.brightness = 0.5
         self.pulse_direction = 1
@@ -29,26 +37,23 @@ class TwinklingSparkleEffect(Effect):
         self.base_hue = random.random()  # Starting point for gradient
         self.gradient_shift = 0  # Gradient phase shift over time
 
-    def generate_gradient_color(self, index, total, hue_shift):
+        # Position of each LED along the gradient
+        total_pixels = self.geometry.count
+        self.gradient_offsets = np.arange(total_pixels, dtype=np.float32) / total_pixels * 0.1
+
+    def generate_gradient_colors(self, hue_shift):
         """
-        Generate a soft gradient color for a given LED index.
+        Generate soft gradient colors for all LEDs.
         """
-        hue = (self.base_hue + (index / total) * 0.1 + hue_shift) % 1.0
+        hue = (self.base_hue + self.gradient_offsets + hue_shift) % 1.0
         saturation = 0.8
         value = self.brightness
-        r, g, b = colorsys.hsv_to_rgb(hue, saturation, value)
-        return int(r * 255), int(g * 255), int(b * 255)
-
-    def update(self):
-        total_pixels = len(self.pixels)
-
-        for i in range(total_pixels):
-            # Decide sparkle or gradient
-            if random.random() < self.sparkle_chance:
-                self.pixels[i] = (255, 255, 255)  # Bright white sparkle
-            else:
-                # Generate gradient color for this LED
-                self.pixels[i] = self.generate_gradient_color(i, total_pixels, self.gradient_shift)
+        return np.clip(hsv_to_rgb_array(hue, saturation, value) * 255, 0, 255).astype(np.uint8)
+
+    def render(self, frame):
+        # Gradient color everywhere, then bright white sparkles on top
+        frame[:] = self.generate_gradient_colors(self.gradient_shift)
+        frame[np.random.random(len(frame)) < self.sparkle_chance] = 255
 
         # Update brightness for pulsing effect
         self.brightness += self.pulse_direction * self.pulse_speed
@@ -1,12 +1,12 @@
 from abstracts.effect import Effect
+from schemas.config_schema import Parameter
 from decoratos.register_effect import RegisterEffect
-import json
 
-from utils.get_tuple_from_json_array import get_tuple_from_json_array
+from geometry.slab_index import BandPainter
 
 """
-LEDs are BRG ordered. Colors should be set as tuples, e.g., x = (b, r, g). 
-The update method is called once per rendering frame.
+Colors are set as (r, g, b) tuples; they are reordered to the LEDs' BRG order on output.
+The render method is called once per rendering frame.
 """
 
 @RegisterEffect()
@@ -25,6 +25,12 @@ class TwoPlainCollisionEffect(Effect):
         "plane_height": 5,
 
     }
+    parameters = {
+        "speed": Parameter("float", 0.01, 50),
+        "color1": Parameter("color"),
+        "color2": Parameter("color"),
+        "plane_height": Parameter("float", 0.1, 200),
+    }
     def __init__(self, **kwargs):
         """
         Initializes the effect with given parameters.
@@ -39,47 +45,34 @@ class TwoPlainCollisionEffect(Effect):
 
         super().__init__(**kwargs)
 
-        self.speed = self.get_config('speed', float)
-        self.plane_height = self.get_config('plane_height', float)
+        self.speed = self.get_config('speed')
+        self.plane_height = self.get_config('plane_height')
 
-        self.color1 = self.get_config('color1', get_tuple_from_json_array)
-        self.color2 = self.get_config('color2', get_tuple_from_json_array)
+        self.color1 = self.get_config('color1')
+        self.color2 = self.get_config('color2')
 
         # Initialize planes' positions and directions
         self.plane_1_y = self.min_y - self.plane_height / 2
         self.plane_2_y = self.max_y + self.plane_height / 2
         self.plane_1_direction = 1
         self.plane_2_direction = -1
+        self.painter = BandPainter()  # Clears the frame on the first render
 
-
-        # Set all LEDs to off initially
-        self.clear_pixels()
-
-    def clear_pixels(self):
-        """Turns off all LEDs."""
-        for i in range(len(self.pixels)):
-            self.pixels[i] = (0, 0, 0)
-
-    def is_within_plane(self, coord_z, plane_y):
+    def leds_within_plane(self, plane_y):
         """
-        Checks if the Z-coordinate is within the range of the plane.
+        Finds the LEDs whose Z-coordinate is within the range of the plane.
 
-        :param coord_z: Z-coordinate of the LED
         :param plane_y: Y-coordinate of the plane center
-        :return: True if within range, False otherwise
+        :return: Indices of the LEDs within range
         """
-        return plane_y - self.plane_height / 2 <= coord_z <= plane_y + self.plane_height / 2
+        return self.geometry.slabs[2].band(plane_y - self.plane_height / 2, plane_y + self.plane_height / 2)
 
-    def update(self):
+    def render(self, frame):
         """Updates the LED colors and plane positions for the current frame."""
-        # Update pixel colors based on proximity to planes
-        for i, coord in enumerate(self.coords):
-            if self.is_within_plane(coord[2], self.plane_1_y):
-                self.pixels[i] = self.color1
-            elif self.is_within_plane(coord[2], self.plane_2_y):
-                self.pixels[i] = self.color2
-            else:
-                self.pixels[i] = (0, 0, 0)
+        # Update pixel colors based on proximity to planes, plane 1 wins where they overlap
+        self.painter.begin(frame)
+        self.painter.paint(frame, self.leds_within_plane(self.plane_2_y), self.color2)
+        self.painter.paint(frame, self.leds_within_plane(self.plane_1_y), self.color1)
 
         # Update plane directions based on boundary collisions
         self.update_plane_directions()
@@ -0,0 +1,107 @@
+import os
+import json
+import struct
+import hashlib
+
+import numpy as np
+
+from geometry.led_geometry import LEDGeometry
+
+# Header: magic, version, LED count, source size, source mtime (ns), sha256 of the positions
+MAGIC = b"XMASCRD\0"
+VERSION = 1
+HEADER = struct.Struct("<8sIIqq32s")
+
+
+class CoordStore:
+    """
+    Binary, memory-mapped copy of the LED coordinates.
+
+    The store file holds a header (LED count, the size and mtime of the
+    source JSON it was generated from, and a content hash of the positions)
+    followed by the (N, 3) float32 positions. It is regenerated whenever the
+    source JSON changes, so warm starts map the positions instead of parsing
+    JSON.
+
+    Derived data is cached per content hash next to it: the geometry tables
+    and spatial index under ``<cache_dir>/geometry/<hash>``; baked frames are
+    keyed by the same hash in the frame cache.
+    """
+
+    SOURCES = ("coords.json", "../laptop/debug_output/led_positions_3d.json")
+
+    def __init__(self, sources=SOURCES, cache_dir="cache"):
+        """
+        :param sources: Coordinate JSON files; the first one that exists is used.
+        :param cache_dir: Directory of the store file and the derived caches.
+        """
+        self.sources = sources
+        self.cache_dir = cache_dir
+        self.path = os.path.join(cache_dir, "coords.bin")
+        self.positions = None
+        self.content_hash = None
+        self._geometry = None
+
+    def load(self):
+        """
+        Memory-map the positions, regenerating the store first if its source changed.
+        :return: Read-only (N, 3) float32 array.
+        """
+        source = next((path for path in self.sources if os.path.isfile(path)), None)
+        header = self._read_header()
+        if source is not None:
+            stat = os.stat(source)
+            if header is None or (header[3], header[4]) != (stat.st_size, stat.st_mtime_ns):
+                self._write(self._parse(source), stat)
+                header = self._read_header()
+        if header is None:
+            raise FileNotFoundError(f"No coordinates found in {', '.join(self.sources)} or {self.path}")
+
+        count = header[2]
+        self.content_hash = header[5].hex()
+        self.positions = np.memmap(self.path, dtype=np.float32, mode="r", offset=HEADER.size, shape=(count, 3))
+        return self.positions
+
+    def geometry(self):
+        """
+        LEDGeometry of the stored positions, with its tables cached by content hash.
+        """
+        if self._geometry is None:
+            if self.positions is None:
+                self.load()
+            self._geometry = LEDGeometry(self.positions, content_hash=self.content_hash,
+                                         cache_dir=os.path.join(self.cache_dir, "geometry", self.content_hash))
+        return self._geometry
+
+    @staticmethod
+    def _parse(source):
+        """
+        Read a coordinate JSON: a list of [x, y, z], or of {"led_id", "x", "y", "z"} objects.
+        """
+        with open(source, "r") as f:
+            data = json.load(f)
+        if data and isinstance(data[0], dict):
+            data = [(led["x"], led["y"], led["z"]) for led in sorted(data, key=lambda led: led["led_id"])]
+        return np.array(data, dtype=np.float32).reshape(-1, 3)
+
+    def _read_header(self):
+        try:
+            with open(self.path, "rb") as f:
+                header = HEADER.unpack(f.read(HEADER.size))
+        except (OSError, struct.error):
+            return None
+        if header[0] != MAGIC or header[1] != VERSION:
+            return None
+        if os.path.getsize(self.path) != HEADER.size + header[2] * 12:
+            return None
+        return header
+
+    def _write(self, positions, stat):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        positions = np.ascontiguousarray(positions, dtype=np.float32)
+        digest = hashlib.sha256(positions.tobytes()).digest()
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(positions), stat.st_size, stat.st_mtime_ns, digest))
+            f.write(positions.tobytes())
+        os.replace(temp_path, self.path)
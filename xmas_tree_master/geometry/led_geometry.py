@@ -0,0 +1,133 @@
+import os
+import hashlib
+
+import numpy as np
+
+from geometry.slab_index import SlabIndex
+from geometry.spatial_index import SpatialIndex
+
+
+class LEDGeometry:
+    """
+    Precomputed geometry for one set of LED coordinates.
+
+    Built once per coordinate set and shared by all effects, so per-frame work
+    is arithmetic on the cached arrays. All arrays are read-only. With a
+    cache directory, the derived tables and the spatial index are computed
+    once and memory-mapped on later starts.
+    """
+
+    # Derived per-LED tables, cached on disk when a cache directory is given
+    TABLES = ("bounds_min", "bounds_max", "extent", "center", "cyl_radius", "cyl_angle", "sph_radius", "sph_polar",
+              "center_distance", "normalized", "sort_order", "sorted_values")
+
+    def __init__(self, coords, content_hash=None, cache_dir=None):
+        """
+        :param coords: A list of 3D coordinates (or an (N, 3) array) for each LED.
+        :param content_hash: Hash of the float32 positions, if already known.
+        :param cache_dir: Directory to load the derived tables and spatial index from, or to store them in.
+            It must be specific to these coordinates, e.g. named after the content hash.
+        """
+        positions = np.array(coords, dtype=np.float32).reshape(-1, 3)
+        self.positions = self._freeze(positions)
+        self.count = len(positions)
+        self.content_hash = content_hash or hashlib.sha256(self.positions.tobytes()).hexdigest()
+        self.x, self.y, self.z = self.positions.T
+        self.cache_dir = cache_dir
+
+        tables = self._load_tables(self.TABLES)
+        if tables is None:
+            tables = self._compute_tables(positions)
+            self._save_tables(tables)
+        for name, table in tables.items():
+            setattr(self, name, table)
+        self.sph_azimuth = self.cyl_angle
+
+        # Band lookups along each axis (index 0 = x, 1 = y, 2 = z)
+        self.slabs = [SlabIndex(None, self.sort_order[axis], self.sorted_values[axis]) for axis in range(3)]
+
+        self._spatial_index = None
+
+    def _compute_tables(self, positions):
+        tables = {}
+        x, y, z = self.x, self.y, self.z
+
+        # Bounds and center
+        tables["bounds_min"] = positions.min(axis=0)
+        tables["bounds_max"] = positions.max(axis=0)
+        tables["extent"] = tables["bounds_max"] - tables["bounds_min"]
+        tables["center"] = positions.mean(axis=0, dtype=np.float64)
+
+        # Cylindrical coordinates around the vertical (z) axis through the origin
+        tables["cyl_radius"] = np.hypot(x, y)
+        tables["cyl_angle"] = np.arctan2(y, x)
+
+        # Spherical coordinates around the origin
+        tables["sph_radius"] = np.linalg.norm(positions, axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            polar = np.arccos(np.clip(z / tables["sph_radius"], -1, 1))
+        tables["sph_polar"] = np.nan_to_num(polar)
+
+        # Distance to the center of the tree
+        tables["center_distance"] = np.linalg.norm(positions - tables["center"], axis=1)
+
+        # Each axis mapped to [0, 1] over the bounds
+        extent = np.where(tables["extent"] > 0, tables["extent"], 1)
+        tables["normalized"] = (positions - tables["bounds_min"]) / extent
+
+        # Per-axis sort orders (row 0 = x, 1 = y, 2 = z) and the sorted values
+        tables["sort_order"] = np.argsort(positions, axis=0, kind="stable").T
+        tables["sorted_values"] = np.take_along_axis(positions.T, tables["sort_order"], axis=1)
+        return {name: self._freeze(table) for name, table in tables.items()}
+
+    def _load_tables(self, names, prefix=""):
+        """
+        Memory-map cached tables, or return None if any is missing.
+        """
+        if self.cache_dir is None:
+            return None
+        paths = {name: os.path.join(self.cache_dir, f"{prefix}{name}.npy") for name in names}
+        if not all(os.path.isfile(path) for path in paths.values()):
+            return None
+        try:
+            return {name: np.load(path, mmap_mode="r") for name, path in paths.items()}
+        except (OSError, ValueError):
+            return None
+
+    def _save_tables(self, tables, prefix=""):
+        if self.cache_dir is None:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            for name, table in tables.items():
+                path = os.path.join(self.cache_dir, f"{prefix}{name}.npy")
+                temp_path = f"{path}.{os.getpid()}.tmp"
+                with open(temp_path, "wb") as f:
+                    np.save(f, np.asarray(table))
+                os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Error caching geometry tables: {e}")
+
+    @property
+    def spatial_index(self):
+        """
+        SpatialIndex over the positions, built on first use.
+        """
+        if self._spatial_index is None:
+            arrays = self._load_tables(SpatialIndex.ARRAYS, prefix="spatial_")
+            if arrays is not None:
+                self._spatial_index = SpatialIndex.restore(self.positions, arrays)
+            else:
+                self._spatial_index = SpatialIndex(self.positions)
+                self._save_tables(self._spatial_index.arrays(), prefix="spatial_")
+        return self._spatial_index
+
+    def __deepcopy__(self, memo):
+        # Read-only, so copies of an effect share it
+        return self
+
+    @staticmethod
+    def _freeze(array):
+        array = np.ascontiguousarray(array)
+        array.setflags(write=False)
+        return array
@@ -0,0 +1,75 @@
+import numpy as np
+
+
+class SlabIndex:
+    """
+    LEDs sorted by one value per LED (e.g. their height) for band lookups.
+
+    A band query bisects the sorted values and returns the matching LEDs as a
+    view into the sorted order, in O(log N + k).
+    """
+
+    def __init__(self, values, order=None, sorted_values=None):
+        """
+        :param values: One value per LED.
+        :param order: LED indices sorted by value, if already known.
+        :param sorted_values: ``values[order]``, if already known.
+        """
+        if order is None:
+            values = np.asarray(values)
+            order = np.argsort(values, kind="stable")
+            sorted_values = values[order]
+        self.order = order
+        self.sorted_values = sorted_values
+
+    def band_range(self, low, high):
+        """
+        Positions [start, stop) in the sorted order of the LEDs with low <= value <= high.
+        """
+        start = int(np.searchsorted(self.sorted_values, low, side="left"))
+        stop = int(np.searchsorted(self.sorted_values, high, side="right"))
+        return start, max(start, stop)
+
+    def __deepcopy__(self, memo):
+        # Read-only, so copies of an effect share it
+        return self
+
+    def band(self, low, high):
+        """
+        Indices of the LEDs with low <= value <= high.
+        """
+        start, stop = self.band_range(low, high)
+        return self.order[start:stop]
+
+
+class BandPainter:
+    """
+    Paints LED bands into a frame, touching only the LEDs of the bands.
+
+    On each frame the LEDs painted in the previous frame are cleared before
+    the new bands are painted. If a different frame array is passed than last
+    time, the whole frame is cleared instead.
+    """
+
+    def __init__(self):
+        self.frame = None
+        self.painted = []
+
+    def begin(self, frame):
+        """
+        Start a new frame: clear what was painted before.
+        """
+        if frame is not self.frame:
+            frame[:] = 0
+            self.frame = frame
+        else:
+            for leds in self.painted:
+                frame[leds] = 0
+        self.painted = []
+
+    def paint(self, frame, leds, colors):
+        """
+        Paint ``leds`` with one color or one color per LED. Later bands win where bands overlap.
+        """
+        frame[leds] = colors
+        self.painted.append(leds)
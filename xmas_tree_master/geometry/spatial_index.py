@@ -0,0 +1,180 @@
+import numpy as np
+
+
+class SpatialIndex:
+    """
+    Uniform grid over the LED positions for radius, shell and nearest-LED queries.
+
+    LEDs are bucketed into cubic cells once; a radius query only looks at the
+    LEDs in the cells overlapping the query's bounding box. Shell queries
+    around a fixed point (the typical "expanding ring" case) are answered from
+    distances sorted once per point, in O(log N + k).
+
+    All queries return arrays of LED indices.
+    """
+
+    MAX_CACHED_SHELL_CENTERS = 8
+    # Arrays that fully describe a built index, see arrays() and restore()
+    ARRAYS = ("origin", "cell_size", "dims", "order", "cell_start")
+
+    def __init__(self, positions, cell_size=None):
+        """
+        :param positions: (N, 3) float array of LED positions.
+        :param cell_size: Edge length of a grid cell; by default about two LEDs per cell.
+        """
+        self.positions = np.asarray(positions, dtype=np.float32)
+        self.count = len(self.positions)
+        self.origin = self.positions.min(axis=0) if self.count else np.zeros(3, dtype=np.float32)
+        extent = (self.positions.max(axis=0) - self.origin) if self.count else np.zeros(3)
+        if cell_size is None:
+            volume = float(np.prod(np.maximum(extent, 1e-3)))
+            cell_size = max((volume * 2 / max(self.count, 1)) ** (1 / 3), 1e-3)
+        # Keep the number of cells in proportion to the number of LEDs (e.g. for flat layouts)
+        max_cells = 4 * self.count + 64
+        while True:
+            self.cell_size = float(cell_size)
+            self.dims = np.floor(extent / self.cell_size).astype(np.int64) + 1
+            if np.prod(self.dims) <= max_cells:
+                break
+            cell_size *= 1.5
+
+        # LED indices sorted by cell, and where each cell's run starts
+        cells = self._cell_of(self.positions)
+        cell_ids = self._linear_id(cells)
+        self.order = np.argsort(cell_ids, kind="stable")
+        sorted_ids = cell_ids[self.order]
+        self.cell_start = np.searchsorted(sorted_ids, np.arange(int(np.prod(self.dims)) + 1))
+
+        self._shell_cache = {}
+
+    def arrays(self):
+        """
+        The index as arrays, e.g. to cache it on disk.
+        """
+        return {
+            "origin": self.origin,
+            "cell_size": np.float64(self.cell_size),
+            "dims": self.dims,
+            "order": self.order,
+            "cell_start": self.cell_start,
+        }
+
+    @classmethod
+    def restore(cls, positions, arrays):
+        """
+        Rebuild an index from ``arrays()`` of an index over the same positions, without bucketing again.
+        """
+        index = cls.__new__(cls)
+        index.positions = np.asarray(positions, dtype=np.float32)
+        index.count = len(index.positions)
+        index.origin = np.asarray(arrays["origin"])
+        index.cell_size = float(arrays["cell_size"])
+        index.dims = np.asarray(arrays["dims"])
+        index.order = arrays["order"]
+        index.cell_start = arrays["cell_start"]
+        index._shell_cache = {}
+        return index
+
+    def __deepcopy__(self, memo):
+        # Only its caches change, so copies of an effect share it
+        return self
+
+    def _cell_of(self, points):
+        cells = np.floor((points - self.origin) / self.cell_size).astype(np.int64)
+        return np.clip(cells, 0, self.dims - 1)
+
+    def _linear_id(self, cells):
+        return (cells[..., 0] * self.dims[1] + cells[..., 1]) * self.dims[2] + cells[..., 2]
+
+    def _candidates(self, lower, upper):
+        """
+        LED indices in all cells overlapping the box [lower, upper].
+        """
+        if np.any(upper < self.origin) or np.any(lower > self.origin + self.dims * self.cell_size):
+            return np.empty(0, dtype=np.int64)
+        _, candidates = self.candidates_in_boxes(np.reshape(lower, (1, 3)), np.reshape(upper, (1, 3)))
+        return candidates
+
+    def candidates_in_boxes(self, lower, upper):
+        """
+        Candidate LEDs for many boxes at once: all LEDs in the cells overlapping each box.
+
+        Boxes outside the grid are clamped to its border cells, so callers must
+        filter the candidates by exact distance.
+        :param lower: (M, 3) lower box corners.
+        :param upper: (M, 3) upper box corners.
+        :return: Tuple of (box, led) index arrays, one entry per candidate pair.
+        """
+        low = self._cell_of(np.asarray(lower, dtype=np.float32))
+        high = self._cell_of(np.asarray(upper, dtype=np.float32))
+
+        # One run of cells along z per (box, x, y) column; such a run is contiguous in the sorted order
+        span_y = high[:, 1] - low[:, 1] + 1
+        columns = (high[:, 0] - low[:, 0] + 1) * span_y
+        box = np.repeat(np.arange(len(low)), columns)
+        k = np.arange(len(box)) - np.repeat(np.cumsum(columns) - columns, columns)
+        ix = low[box, 0] + k // span_y[box]
+        iy = low[box, 1] + k % span_y[box]
+        first = self._linear_id(np.stack((ix, iy, low[box, 2]), axis=-1))
+        last = self._linear_id(np.stack((ix, iy, high[box, 2]), axis=-1))
+        start = self.cell_start[first]
+        counts = self.cell_start[last + 1] - start
+
+        owner = np.repeat(box, counts)
+        offsets = np.repeat(start - (np.cumsum(counts) - counts), counts)
+        return owner, self.order[offsets + np.arange(len(owner))]
+
+    def within_radius(self, point, radius, return_distance=False):
+        """
+        LEDs within ``radius`` of ``point``.
+        :param return_distance: Also return the distance of each returned LED.
+        """
+        point = np.asarray(point, dtype=np.float32)
+        candidates = self._candidates(point - radius, point + radius)
+        distances = np.linalg.norm(self.positions[candidates] - point, axis=1)
+        inside = distances <= radius
+        if return_distance:
+            return candidates[inside], distances[inside]
+        return candidates[inside]
+
+    def within_shell(self, point, inner_radius, outer_radius, axes=(0, 1, 2), return_distance=False):
+        """
+        LEDs whose distance to ``point`` lies in [inner_radius, outer_radius].
+        :param axes: Axes the distance is measured over, e.g. (0, 2) for rings in the XZ plane.
+        :param return_distance: Also return the distance of each returned LED.
+        """
+        sorted_distances, order = self._sorted_distances(point, axes)
+        start = np.searchsorted(sorted_distances, inner_radius, side="left")
+        stop = np.searchsorted(sorted_distances, outer_radius, side="right")
+        if return_distance:
+            return order[start:stop], sorted_distances[start:stop]
+        return order[start:stop]
+
+    def _sorted_distances(self, point, axes):
+        axes = tuple(axes)
+        key = (tuple(float(v) for v in np.asarray(point)[list(axes)]), axes)
+        if key not in self._shell_cache:
+            if len(self._shell_cache) >= self.MAX_CACHED_SHELL_CENTERS:
+                self._shell_cache.pop(next(iter(self._shell_cache)))
+            distances = np.linalg.norm(self.positions[:, axes] - np.array(key[0], dtype=np.float32), axis=1)
+            order = np.argsort(distances, kind="stable")
+            self._shell_cache[key] = (distances[order], order)
+        return self._shell_cache[key]
+
+    def nearest(self, point, k=1):
+        """
+        The ``k`` LEDs nearest to ``point``, closest first.
+        """
+        k = min(k, self.count)
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        point = np.asarray(point, dtype=np.float32)
+        # Grow the search radius until it holds at least k LEDs; the k nearest are then among them
+        radius = self.cell_size + float(np.linalg.norm(np.maximum(self.origin - point, 0) +
+                                                       np.maximum(point - self.origin - self.dims * self.cell_size, 0)))
+        while True:
+            indices, distances = self.within_radius(point, radius, return_distance=True)
+            if len(indices) >= k:
+                closest = np.argsort(distances, kind="stable")[:k]
+                return indices[closest]
+            radius *= 2
@@ -2,28 +2,26 @@
 import time
 import json
 import argparse
+import threading
 import paho.mqtt.client as mqtt
-import matplotlib
-from matplotlib import rcParams
-from matplotlib.animation import FuncAnimation
-import numpy as np
-import matplotlib.pyplot as plt
 
-from utils.load_coords import load_coords
+from geometry.coord_store import CoordStore
 from controllers.led_controller import LEDController
 from controllers.effect_controller import EffectController
 from registry.effect_registry import EffectRegistry
+from caches.config_store import ConfigStore
+from caches.frame_cache import FrameCache
+from streaming.frame_streamer import FrameStreamer
+from utils.open_stream_transport import open_stream_transport
 from utils.register_effects import registered_effects
 
-matplotlib.use('webagg')
-rcParams['webagg.address'] = '0.0.0.0'
-
 with open("configs/config_master.json") as f:
     config_data = json.load(f)
 
 default_client_id = config_data.get("client_id", "unknown")
 
 coords = None
+controller = None
 effect_controller = None
 
 def publish_available_effects(client, client_id):
@@ -39,6 +37,20 @@ def publish_available_effects(client, client_id):
 
     client.publish(f"led/effects/{client_id}", json.dumps(data))
 
+def publish_stats(client, client_id, controller, interval):
+    """
+    Periodically publishes the render loop's performance summary for this client.
+    """
+    while controller.running:
+        time.sleep(interval)
+        data = {"client_id": client_id}
+        data.update(controller.stats.summary())
+        data["commands"] = controller.commands.summary()
+        streamer = controller.streamer
+        if streamer is not None:
+            data["stream"] = streamer.summary()
+        client.publish(f"led/stats/{client_id}", json.dumps(data))
+
 def on_connect(client, userdata, flags, rc, properties):
     print(rc)
     if rc == 0:
@@ -51,48 +63,76 @@ def on_disconnect(client, userdata, flags, rc, properties):
     print("Disconnected from MQTT broker")
     client.publish("led/clients", json.dumps({"client_id": my_client_id, "status": "disconnected"}))
 
+def command_key(topic, payload):
+    """
+    Key under which a control message is queued; a newer message with the same key supersedes a queued one.
+    """
+    if topic == "led/layers" and "index" in payload:
+        return topic, payload["index"]
+    if topic == "led/layers":
+        return ("led/effect",)  # A new layer stack replaces the effect, just like a new effect
+    if topic == "led/effect/save-default":
+        return topic, payload.get("effect_name")
+    if topic == "led/effect/config":
+        return topic, tuple(sorted(payload.get("config", {})))  # Patches of other parameters are kept
+    return (topic,)
+
+def apply_command(topic, payload):
+    """
+    Applies a control message. Runs on the render loop, between two frames.
+    """
+    if topic == "led/effect":
+        selector = payload.get("effect_name", "").lower()
+        config = payload.get("config", {})
+        print(f"Received effect for this client ({my_client_id}): {selector} with config {config}")
+        effect_controller.change_effect(selector, client_id=my_client_id, crossfade=payload.get("crossfade"),
+                                        **config)
+
+    elif topic == "led/effect/config":
+        effect_controller.update_config(client_id=my_client_id, **payload.get("config", {}))
+
+    elif topic == "led/layers":
+        if "index" in payload:
+            effect_controller.update_layer(int(payload["index"]), blend=payload.get("blend"),
+                                           opacity=payload.get("opacity"), enabled=payload.get("enabled"))
+        else:
+            effect_controller.set_layers(payload.get("layers", []), client_id=my_client_id,
+                                         crossfade=payload.get("crossfade"))
+
+    elif topic == "led/brightness":
+        controller.set_brightness(float(payload["brightness"]))
+        print(f"Brightness set to {controller.color_pipeline.brightness}")
+
+    elif topic == "led/record":
+        if payload.get("action") == "stop":
+            controller.stop_recording()
+        else:
+            controller.start_recording(payload.get("file", "recordings/show.rec"),
+                                       compression=payload.get("compression", "delta"))
+
+    elif topic == "led/effect/save-default":
+        effect_name = payload.get("effect_name")
+        config = payload.get("config", {})
+        effect_controller.save_default_config(my_client_id, effect_name, config)
+        print(f"Saved default config for {effect_name}")
+
 def on_message(client, userdata, message):
     try:
-        if message.topic == "led/effect":
-            payload = json.loads(message.payload.decode("utf-8"))
-            if payload.get("client_id") == my_client_id:
-                selector = payload.get("effect_name", "").lower()
-                config = payload.get("config", {})
-                print(f"Received effect for this client ({my_client_id}): {selector} with config {config}")
-                effect_controller.change_effect(selector, client_id=my_client_id, **config)
-
-        elif message.topic == "led/effect/save-default":
-            payload = json.loads(message.payload.decode("utf-8"))
-            if payload.get("client_id") == my_client_id:
-                effect_name = payload.get("effect_name")
-                config = payload.get("config", {})
-                effect_controller.save_default_config(my_client_id, effect_name, config)
-                print(f"Saved default config for {effect_name}")
+        payload = json.loads(message.payload.decode("utf-8"))
+        if payload.get("client_id") == my_client_id:
+            # Only queue the message here; the render loop applies queued messages between frames
+            topic = message.topic
+            controller.commands.put(command_key(topic, payload), lambda: apply_command(topic, payload))
     except Exception as e:
         print(f"Error handling MQTT message: {e}")
 
-def plot_leds(controller, coords):
-    fig = plt.figure(figsize=(12, 8))
-    ax = fig.add_subplot(111, projection="3d")
-    x, y, z = zip(*coords)
-    scatter = ax.scatter(x, y, z, c=[[0, 0, 0] for _ in coords], s=100)
-    ax.set_xlim([-100, 100])
-    ax.set_ylim([-100, 100])
-    ax.set_zlim([-100, 100])
-    ax.set_box_aspect([1, 1, 1])
-    ax.set_xlabel("X Axis")
-    ax.set_ylabel("Y Axis")
-    ax.set_zlabel("Z Axis")
-    ax.set_title(f"3D LED Visualizer - Client ID: {my_client_id}")
-
-    def update(frame):
-        pixels = controller.get_plot_data()
-        if pixels:
-            colors = [tuple(np.array([c[0], c[1], c[2]]) / 255) for c in pixels]
-            scatter.set_color(colors)
-
-    anim = FuncAnimation(fig, update, interval=0.3, cache_frame_data=False)
-    plt.show()
+def plot_leds(controller, coords, port):
+    # The visualizer is only imported when rendering is requested
+    from visualizer.web_visualizer import WebVisualizer
+
+    visualizer = WebVisualizer(controller.frames, coords, port=port, fps=min(controller.scheduler.fps or 30, 30),
+                               title=f"3D LED Visualizer - Client ID: {my_client_id}")
+    visualizer.run()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="3D LED Effect Visualizer")
@@ -101,15 +141,36 @@ if __name__ == "__main__":
     parser.add_argument('--dry', action=argparse.BooleanOptionalAction)
     parser.add_argument('--client-id', default=default_client_id)
     parser.add_argument('--port', type=int, default=8888)
+    parser.add_argument('--fps', type=float, default=config_data.get("fps", 30))
+    parser.add_argument('--overrun-policy', choices=["skip", "catch-up"], default=config_data.get("overrun_policy", "skip"))
+    parser.add_argument('--bake', action=argparse.BooleanOptionalAction,
+                        help="Bake periodic effects into a frame cache and play them back")
+    parser.add_argument('--crossfade', type=float, default=config_data.get("crossfade", 0.5),
+                        help="Seconds to crossfade between effects")
+    parser.add_argument('--record', help="Record every shown frame into this file")
+    parser.add_argument('--record-compression', choices=["none", "delta", "rle"], default="delta")
+    parser.add_argument('--stream', help="Stream every shown frame to thin clients: udp://host:port or mqtt://topic")
+    parser.add_argument('--stream-compression', choices=["none", "delta", "rle"], default="delta")
+    parser.add_argument('--stats-interval', type=float, default=config_data.get("stats_interval", 10))
     args = parser.parse_args()
 
     my_client_id = args.client_id
-    webagg_port = args.port
-    rcParams['webagg.port'] = webagg_port
 
-    coords = load_coords()
-    controller = LEDController(coords, pixel_count=len(coords), drymode=(args.dry or False))
-    effect_controller = EffectController(controller)
+    coord_store = CoordStore()
+    coords = coord_store.load()
+    controller = LEDController(coords, pixel_count=len(coords), drymode=(args.dry or False),
+                               fps=args.fps, overrun_policy=args.overrun_policy,
+                               color_order=config_data.get("color_order", "BRG"),
+                               brightness=config_data.get("brightness", 0.5),
+                               gamma=config_data.get("gamma", (1.0, 1.0, 1.0)),
+                               white_balance=config_data.get("white_balance", (1.0, 1.0, 1.0)),
+                               crossfade=args.crossfade, geometry=coord_store.geometry())
+    frame_cache = None
+    if args.bake:
+        frame_cache = FrameCache(max_bytes=config_data.get("bake_cache_mb", 256) * 1024 * 1024)
+    config_store = ConfigStore()
+    effect_controller = EffectController(controller, frame_cache=frame_cache, background=True,
+                                         config_store=config_store)
     if args.effect:
         effect_controller.change_effect(args.effect, client_id=my_client_id)
 
@@ -120,20 +181,32 @@ if __name__ == "__main__":
     mqtt_client.connect("fancyguysdev.de")
     mqtt_client.subscribe("led/effect")
     mqtt_client.subscribe("led/effect/save-default")
+    mqtt_client.subscribe("led/effect/config")
+    mqtt_client.subscribe("led/brightness")
+    mqtt_client.subscribe("led/layers")
+    mqtt_client.subscribe("led/record")
     mqtt_client.loop_start()
 
+    if args.record:
+        controller.start_recording(args.record, compression=args.record_compression)
+    if args.stream:
+        controller.start_streaming(FrameStreamer(open_stream_transport(args.stream, mqtt_client), len(coords),
+                                                 args.fps, compression=args.stream_compression))
     controller.start()
+    threading.Thread(target=publish_stats, args=(mqtt_client, my_client_id, controller, args.stats_interval),
+                     daemon=True).start()
 
     try:
         if args.render:
-            plot_leds(controller, coords)
+            plot_leds(controller, coords, args.port)
         else:
             while controller.running:
                 time.sleep(1)
     except KeyboardInterrupt:
         print("Stopping...")
-        controller.stop()
     finally:
+        controller.stop()
+        config_store.close()  # Write pending default configs
         mqtt_client.publish("led/clients", json.dumps({"client_id": my_client_id, "status": "disconnected"}))
         mqtt_client.loop_stop()
         mqtt_client.disconnect()
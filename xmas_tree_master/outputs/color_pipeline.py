@@ -0,0 +1,50 @@
+import numpy as np
+
+
+class ColorPipeline:
+    """
+    Output color stage: global brightness, per-channel gamma and white balance.
+
+    All three are folded into one 256-entry uint8 lookup table per channel, so
+    a frame is corrected with three table lookups instead of float math per
+    pixel. Tables are cached per brightness level, so changing the brightness
+    at runtime only rebuilds (or reuses) the tables.
+    """
+
+    def __init__(self, pixel_count, brightness=1.0, gamma=(1.0, 1.0, 1.0), white_balance=(1.0, 1.0, 1.0)):
+        """
+        :param pixel_count: Number of LEDs per frame.
+        :param brightness: Global brightness in [0, 1].
+        :param gamma: Gamma exponent per (r, g, b) channel.
+        :param white_balance: Scale factor per (r, g, b) channel in [0, 1].
+        """
+        self.gamma = np.array(gamma, dtype=np.float64).reshape(3, 1)
+        self.white_balance = np.array(white_balance, dtype=np.float64).reshape(3, 1)
+        self.tables = {}
+        self.out = np.zeros((pixel_count, 3), dtype=np.uint8)
+        self.set_brightness(brightness)
+
+    def set_brightness(self, brightness):
+        """
+        Change the global brightness.
+        """
+        brightness = round(min(max(float(brightness), 0.0), 1.0), 3)
+        if brightness not in self.tables:
+            self.tables[brightness] = self._build_table(brightness)
+        self.brightness = brightness
+        self.table = self.tables[brightness]
+
+    def _build_table(self, brightness):
+        levels = np.arange(256, dtype=np.float64) / 255
+        corrected = 255 * levels ** self.gamma * self.white_balance * brightness
+        # Small epsilon so identity settings map every level onto itself
+        return np.clip(np.floor(corrected + 1e-6), 0, 255).astype(np.uint8)
+
+    def apply(self, frame):
+        """
+        Correct an ``(N, 3)`` uint8 (r, g, b) frame.
+        :return: The corrected frame; a preallocated buffer that is reused on the next call.
+        """
+        for channel in range(3):
+            np.take(self.table[channel], frame[:, channel], out=self.out[:, channel])
+        return self.out
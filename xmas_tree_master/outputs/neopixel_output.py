@@ -0,0 +1,45 @@
+import numpy as np
+
+
+class NeoPixelOutput:
+    """
+    Writes finished frames to a NeoPixel strip in one bulk copy.
+
+    Instead of assigning every pixel through ``NeoPixel.__setitem__`` (which
+    does color order and brightness work in Python per pixel), the frame is
+    reordered with array math and copied straight into the driver's transmit
+    buffer. Brightness is applied beforehand by the ColorPipeline, so the
+    driver runs at brightness 1.0.
+    """
+
+    def __init__(self, pixel_count):
+        """
+        :param pixel_count: Number of LEDs on the strip.
+        """
+        import neopixel
+        import board
+        self.strip = neopixel.NeoPixel(board.D18, pixel_count, brightness=1.0, auto_write=False)
+        self.strip.fill((0, 0, 0))
+
+        # View on the driver's transmit buffer, if its layout is the one we know
+        byteorder = getattr(self.strip, "_byteorder", None)
+        buffer = getattr(self.strip, "_post_brightness_buffer", None)
+        offset = getattr(self.strip, "_offset", 0)
+        if byteorder is not None and buffer is not None and getattr(self.strip, "_bpp", 3) == 3:
+            self.wire = np.frombuffer(buffer, dtype=np.uint8, count=pixel_count * 3, offset=offset)
+            self.wire = self.wire.reshape(pixel_count, 3)
+            self.byteorder = list(byteorder[:3])
+        else:
+            self.wire = None
+            self.byteorder = None
+
+    def show(self, device_frame):
+        """
+        Transmit an ``(N, 3)`` uint8 frame that is already in the driver's color order.
+        """
+        if self.wire is not None:
+            self.wire[:, self.byteorder] = device_frame
+        else:
+            # Unknown driver internals: fall back to per-pixel assignment
+            self.strip[:] = [tuple(color) for color in device_frame.tolist()]
+        self.strip.show()
@@ -0,0 +1,129 @@
+import numpy as np
+
+
+class ParticleSystem:
+    """
+    Fixed-capacity particle engine for effects, stored as a struct of arrays.
+
+    Every particle has a position, velocity, (r, g, b) color, age, lifetime,
+    glow radius and trail length. A particle lights the LEDs within ``radius``
+    of the segment from its head back along its velocity for ``trail`` units;
+    the brightness fades with the distance to the segment and along the trail.
+
+    Spawning, advancing, culling and rendering are vectorized over all
+    particles. Rendering finds candidate LEDs for all particles at once through
+    the geometry's spatial index and blends all contributions into the frame
+    in one pass.
+    """
+    BLEND_MODES = ("max", "add")
+
+    def __init__(self, geometry, capacity):
+        """
+        :param geometry: LEDGeometry of the tree the particles are rendered on.
+        :param capacity: Maximum number of live particles.
+        """
+        self.geometry = geometry
+        self.capacity = capacity
+        self.position = np.zeros((capacity, 3), dtype=np.float32)
+        self.velocity = np.zeros((capacity, 3), dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.zeros(capacity, dtype=np.float32)
+        self.radius = np.zeros(capacity, dtype=np.float32)
+        self.trail = np.zeros(capacity, dtype=np.float32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.accumulator = np.zeros((geometry.count, 3), dtype=np.float32)
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def spawn(self, position, velocity, color, radius, trail=0.0, lifetime=np.inf):
+        """
+        Spawn particles into free slots. Arguments are per-particle arrays (or broadcastable scalars).
+        :param position: (K, 3) head positions; K is the number of particles to spawn.
+        :return: Number of particles spawned, fewer than K if the capacity is exhausted.
+        """
+        position = np.asarray(position, dtype=np.float32).reshape(-1, 3)
+        slots = np.flatnonzero(~self.alive)[:len(position)]
+        count = len(slots)
+        self.position[slots] = position[:count]
+        self.velocity[slots] = np.broadcast_to(velocity, (len(position), 3))[:count]
+        self.color[slots] = np.broadcast_to(color, (len(position), 3))[:count]
+        self.radius[slots] = np.broadcast_to(radius, len(position))[:count]
+        self.trail[slots] = np.broadcast_to(trail, len(position))[:count]
+        self.lifetime[slots] = np.broadcast_to(lifetime, len(position))[:count]
+        self.age[slots] = 0
+        self.alive[slots] = True
+        return count
+
+    def resize(self, capacity):
+        """
+        Change the capacity, keeping live particles; the newest are dropped if they do not fit.
+        """
+        keep = np.flatnonzero(self.alive)[:capacity]
+        for name in ("position", "velocity", "color", "age", "lifetime", "radius", "trail", "alive"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:len(keep)] = old[keep]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def advance(self, dt=1.0):
+        """
+        Move all live particles along their velocity and age them.
+        """
+        alive = self.alive
+        self.position[alive] += self.velocity[alive] * dt
+        self.age[alive] += dt
+
+    def cull(self, lower=(-np.inf, -np.inf, -np.inf), upper=(np.inf, np.inf, np.inf)):
+        """
+        Kill particles outside the open box (lower, upper) or past their lifetime.
+        """
+        inside = np.all((self.position > lower) & (self.position < upper), axis=1)
+        self.alive &= inside & (self.age < self.lifetime)
+
+    def render(self, frame, blend="max"):
+        """
+        Blend the contributions of all live particles into ``frame`` (an (N, 3) uint8 array).
+        :param blend: "max" keeps the brightest contribution per channel, "add" sums them.
+        """
+        if blend not in self.BLEND_MODES:
+            raise ValueError(f"Unknown blend mode: {blend}")
+        particles = np.flatnonzero(self.alive)
+        if not len(particles):
+            return
+
+        head = self.position[particles]
+        speed = np.linalg.norm(self.velocity[particles], axis=1, keepdims=True)
+        backwards = -np.divide(self.velocity[particles], speed, out=np.zeros_like(head), where=speed > 0)
+        trail = self.trail[particles]
+        radius = self.radius[particles]
+        tail = head + backwards * trail[:, None]
+
+        # Candidate LEDs: the grid cells covering each particle's head, trail and glow
+        lower = np.minimum(head, tail) - radius[:, None]
+        upper = np.maximum(head, tail) + radius[:, None]
+        owner, leds = self.geometry.spatial_index.candidates_in_boxes(lower, upper)
+
+        # Distance of each candidate LED to its particle's trail segment
+        offset = self.geometry.positions[leds] - head[owner]
+        along = np.einsum("ij,ij->i", offset, backwards[owner])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = np.where(trail[owner] > 0, np.clip(along / trail[owner], 0, 1), 0)
+            closest = backwards[owner] * (t * trail[owner])[:, None]
+            distance = np.linalg.norm(offset - closest, axis=1)
+            intensity = (1 - distance / radius[owner]) * (1 - t)
+
+        lit = intensity > 0
+        leds = leds[lit]
+        contribution = intensity[lit, None] * self.color[particles][owner[lit]]
+
+        accumulator = self.accumulator
+        accumulator[:] = frame
+        if blend == "max":
+            np.maximum.at(accumulator, leds, contribution)
+        else:
+            np.add.at(accumulator, leds, contribution)
+        np.clip(accumulator, 0, 255, out=accumulator)
+        frame[:] = accumulator
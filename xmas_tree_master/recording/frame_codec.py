@@ -0,0 +1,84 @@
+import struct
+
+import numpy as np
+
+# File header: magic, version, LED count, fps, strip color order, compression, index offset, frame count
+MAGIC = b"XMASREC\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHIf4sBQI")
+
+# Compression modes and the record type each frame is stored as
+COMPRESSIONS = ("none", "delta", "rle")
+
+# Frame record types
+RAW = 0     # Full frame, N * 3 bytes
+DELTA = 1   # Changed LEDs against the previous frame
+RLE = 2     # Full frame as runs of equal colors
+
+# Record header: type, payload length
+RECORD_HEADER = struct.Struct("<BI")
+
+KEYFRAME_TYPES = (RAW, RLE)
+
+
+def encode_raw(frame):
+    return np.ascontiguousarray(frame, dtype=np.uint8).tobytes()
+
+
+def encode_delta(frame, previous):
+    """
+    Encode the LEDs of ``frame`` that differ from ``previous``: count, indices, colors.
+    """
+    changed = np.flatnonzero(np.any(frame != previous, axis=1)).astype("<u4")
+    return (struct.pack("<I", len(changed)) + changed.tobytes() +
+            np.ascontiguousarray(frame[changed], dtype=np.uint8).tobytes())
+
+
+def encode_rle(frame):
+    """
+    Encode ``frame`` as runs of equal colors: run count, run lengths, run colors.
+    """
+    frame = np.ascontiguousarray(frame, dtype=np.uint8)
+    packed = (frame[:, 0].astype(np.uint32) << 16) | (frame[:, 1].astype(np.uint32) << 8) | frame[:, 2]
+    starts = np.concatenate(([0], np.flatnonzero(packed[1:] != packed[:-1]) + 1)) if len(packed) else np.empty(0, int)
+    lengths = np.diff(np.append(starts, len(packed))).astype("<u4")
+    return struct.pack("<I", len(starts)) + lengths.tobytes() + frame[starts].tobytes()
+
+
+def encode(frame_type, frame, previous=None):
+    if frame_type == RAW:
+        return encode_raw(frame)
+    if frame_type == DELTA:
+        return encode_delta(frame, previous)
+    if frame_type == RLE:
+        return encode_rle(frame)
+    raise ValueError(f"Unknown frame type: {frame_type}")
+
+
+def decode(frame_type, payload, led_count, previous=None, out=None):
+    """
+    Decode one frame record into ``out`` (a new (N, 3) array if not given).
+    :param previous: The previous frame, required for DELTA records.
+    """
+    if out is None:
+        out = np.empty((led_count, 3), dtype=np.uint8)
+    payload = memoryview(payload)
+    if frame_type == RAW:
+        out[:] = np.frombuffer(payload, dtype=np.uint8, count=led_count * 3).reshape(led_count, 3)
+    elif frame_type == DELTA:
+        if previous is None:
+            raise ValueError("Delta frame without a previous frame")
+        count, = struct.unpack_from("<I", payload)
+        indices = np.frombuffer(payload, dtype="<u4", count=count, offset=4)
+        colors = np.frombuffer(payload, dtype=np.uint8, count=count * 3, offset=4 + 4 * count).reshape(count, 3)
+        if out is not previous:
+            out[:] = previous
+        out[indices] = colors
+    elif frame_type == RLE:
+        count, = struct.unpack_from("<I", payload)
+        lengths = np.frombuffer(payload, dtype="<u4", count=count, offset=4)
+        colors = np.frombuffer(payload, dtype=np.uint8, count=count * 3, offset=4 + 4 * count).reshape(count, 3)
+        out[:] = np.repeat(colors, lengths, axis=0)
+    else:
+        raise ValueError(f"Unknown frame type: {frame_type}")
+    return out
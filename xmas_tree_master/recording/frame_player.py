@@ -0,0 +1,122 @@
+import mmap
+
+import numpy as np
+
+from recording import frame_codec
+
+
+class FramePlayer:
+    """
+    Reads a recording written by ``FrameRecorder`` through a memory map.
+
+    Frames can be fetched by index or by time. Sequential reads decode only
+    the next record; seeking decodes forward from the nearest keyframe.
+    Recordings that were not closed (e.g. after a crash) are indexed by
+    scanning their records.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: Recording file to play.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.map) < frame_codec.HEADER.size:
+            raise ValueError(f"Not a frame recording: {path}")
+        magic, version, led_count, fps, color_order, compression, index_offset, frame_count = \
+            frame_codec.HEADER.unpack_from(self.map)
+        if magic != frame_codec.MAGIC or version != frame_codec.VERSION:
+            raise ValueError(f"Not a frame recording: {path}")
+        self.led_count = led_count
+        self.fps = fps
+        self.color_order = color_order.rstrip(b"\0").decode("ascii")
+        self.compression = frame_codec.COMPRESSIONS[compression]
+
+        if index_offset:
+            self.offsets = np.frombuffer(self.map, dtype="<u8", count=frame_count, offset=index_offset)
+            self.types = np.frombuffer(self.map, dtype=np.uint8, count=frame_count,
+                                       offset=index_offset + 8 * frame_count)
+        else:
+            self.offsets, self.types = self._scan()
+        self.keyframes = np.flatnonzero(np.isin(self.types, frame_codec.KEYFRAME_TYPES))
+
+        self.frame = np.zeros((led_count, 3), dtype=np.uint8)
+        self.position = -1  # Index of the frame currently decoded into self.frame
+
+    def __len__(self):
+        return len(self.offsets)
+
+    @property
+    def duration(self):
+        """
+        Length of the recording in seconds, or None if its fps is unknown.
+        """
+        return len(self) / self.fps if self.fps else None
+
+    def read(self, index):
+        """
+        Frame ``index`` as an (N, 3) uint8 RGB array, valid until the next read.
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(f"Frame {index} out of range")
+        if index == self.position:
+            return self.frame
+        if self.types[index] != frame_codec.DELTA:
+            start = index
+        else:
+            # Decode forward from the nearest keyframe, or from the current frame if that is closer
+            before = np.searchsorted(self.keyframes, index, side="right") - 1
+            if before < 0:
+                raise ValueError(f"No keyframe before frame {index}")
+            start = int(self.keyframes[before])
+            if start <= self.position < index:
+                start = self.position + 1
+        for i in range(start, index + 1):
+            self._decode(i)
+        return self.frame
+
+    def index_at(self, seconds, loop=False):
+        """
+        Index of the frame shown ``seconds`` into the recording.
+        :param loop: Wrap around at the end instead of holding the last frame.
+        """
+        index = int(seconds * self.fps) if self.fps else 0
+        if loop:
+            return index % len(self)
+        return min(max(index, 0), len(self) - 1)
+
+    def read_at(self, seconds, loop=False):
+        """
+        Frame shown ``seconds`` into the recording.
+        """
+        return self.read(self.index_at(seconds, loop))
+
+    def close(self):
+        self.offsets = self.types = None
+        self.map.close()
+
+    def _decode(self, index):
+        offset = int(self.offsets[index])
+        frame_type, length = frame_codec.RECORD_HEADER.unpack_from(self.map, offset)
+        start = offset + frame_codec.RECORD_HEADER.size
+        frame_codec.decode(frame_type, memoryview(self.map)[start:start + length], self.led_count,
+                           previous=self.frame, out=self.frame)
+        self.position = index
+
+    def _scan(self):
+        """
+        Index an unclosed recording by walking its records, ignoring a truncated last record.
+        """
+        offsets, types = [], []
+        offset = frame_codec.HEADER.size
+        record_size = frame_codec.RECORD_HEADER.size
+        while offset + record_size <= len(self.map):
+            frame_type, length = frame_codec.RECORD_HEADER.unpack_from(self.map, offset)
+            if offset + record_size + length > len(self.map):
+                break
+            offsets.append(offset)
+            types.append(frame_type)
+            offset += record_size + length
+        return np.asarray(offsets, dtype=np.uint64), np.asarray(types, dtype=np.uint8)
@@ -0,0 +1,111 @@
+import os
+import threading
+
+import numpy as np
+
+from recording import frame_codec
+
+
+class FrameRecorder:
+    """
+    Appends frames to a compact binary recording.
+
+    A recording starts with a header (LED count, fps, the strip's color order
+    and the compression), followed by one record per frame and, once the
+    recording is closed, an index of the record offsets. Frames are stored as
+    (r, g, b) before brightness and gamma, exactly as the effects produced them.
+
+    Compression:
+
+    * ``"none"``: every frame is stored raw (N * 3 bytes).
+    * ``"delta"``: only the LEDs that changed since the previous frame are
+      stored, with a raw keyframe every ``keyframe_interval`` frames so the
+      player can seek.
+    * ``"rle"``: every frame is stored as runs of equal colors.
+
+    Frames that would get larger than raw with the chosen compression are stored raw.
+    """
+
+    def __init__(self, path, led_count, fps, color_order="BRG", compression="none", keyframe_interval=None):
+        """
+        :param path: File to write; an existing file is overwritten.
+        :param led_count: Number of LEDs per frame.
+        :param fps: Frame rate the frames were shown at.
+        :param color_order: Channel order of the strip the frames were shown on.
+        :param compression: "none", "delta" or "rle".
+        :param keyframe_interval: Frames between keyframes for delta compression; two seconds by default.
+        """
+        if compression not in frame_codec.COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        self.path = path
+        self.led_count = led_count
+        self.fps = float(fps or 0)
+        self.color_order = color_order
+        self.compression = compression
+        self.keyframe_interval = keyframe_interval or max(int(2 * self.fps), 1)
+        self.offsets = []
+        self.types = []
+        self.previous = np.zeros((led_count, 3), dtype=np.uint8)
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.file = open(path, "wb")
+        self._write_header(index_offset=0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def frame_count(self):
+        return len(self.offsets)
+
+    def write(self, frame, repeat=1):
+        """
+        Append ``frame`` (an (N, 3) uint8 RGB array).
+        :param repeat: How many frame slots the frame was shown for, e.g. 1 + dropped frames.
+        """
+        with self.lock:
+            if self.file is None:
+                return
+            for _ in range(repeat):
+                frame_type = self._next_type()
+                payload = frame_codec.encode(frame_type, frame, self.previous)
+                if len(payload) > self.led_count * 3:
+                    # Busy frames compress badly; store them raw (which also makes them keyframes)
+                    frame_type = frame_codec.RAW
+                    payload = frame_codec.encode_raw(frame)
+                self.offsets.append(self.file.tell())
+                self.types.append(frame_type)
+                self.file.write(frame_codec.RECORD_HEADER.pack(frame_type, len(payload)))
+                self.file.write(payload)
+                self.previous[:] = frame
+
+    def close(self):
+        """
+        Write the index and finish the header. Further writes are ignored.
+        """
+        with self.lock:
+            if self.file is None:
+                return
+            index_offset = self.file.tell()
+            self.file.write(np.asarray(self.offsets, dtype="<u8").tobytes())
+            self.file.write(np.asarray(self.types, dtype=np.uint8).tobytes())
+            self.file.seek(0)
+            self._write_header(index_offset)
+            self.file.close()
+            self.file = None
+
+    def _next_type(self):
+        if self.compression == "rle":
+            return frame_codec.RLE
+        if self.compression == "delta" and len(self.offsets) % self.keyframe_interval:
+            return frame_codec.DELTA
+        return frame_codec.RAW
+
+    def _write_header(self, index_offset):
+        self.file.write(frame_codec.HEADER.pack(
+            frame_codec.MAGIC, frame_codec.VERSION, self.led_count, self.fps,
+            self.color_order.encode("ascii").ljust(4, b"\0"),
+            frame_codec.COMPRESSIONS.index(self.compression), index_offset, len(self.offsets)))
@@ -0,0 +1,79 @@
+import os
+import json
+import hashlib
+import importlib
+
+from registry.effect_registry import EffectRegistry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class EffectManifest:
+    """
+    Cached description of all effects, so startup does not import every effect module.
+
+    The manifest lists each effect's selector, name, module, defaults and
+    schema. It is keyed by a fingerprint of the effect modules' (and the
+    schema compiler's) file sizes and mtimes; if any changed, all effect
+    modules are imported once and the manifest is rebuilt.
+    """
+
+    def __init__(self, path="cache/effects_manifest.json", package="effects"):
+        """
+        :param path: Where the manifest is cached.
+        :param package: Package whose modules define the effects.
+        """
+        self.path = path
+        self.package = package
+
+    def modules(self):
+        directory = os.path.join(ROOT, self.package)
+        return sorted(name[:-3] for name in os.listdir(directory)
+                      if name.endswith(".py") and not name.startswith("__"))
+
+    def fingerprint(self, modules):
+        digest = hashlib.sha256()
+        files = [os.path.join(self.package, f"{module}.py") for module in modules]
+        files.append(os.path.join("schemas", "config_schema.py"))
+        for name in files:
+            stat = os.stat(os.path.join(ROOT, name))
+            digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns};".encode("utf-8"))
+        return digest.hexdigest()
+
+    def register(self):
+        """
+        Register all effects, lazily from the manifest if it is up to date.
+        """
+        modules = self.modules()
+        fingerprint = self.fingerprint(modules)
+        manifest = self.load()
+        if manifest is not None and manifest.get("fingerprint") == fingerprint:
+            for entry in manifest["effects"]:
+                EffectRegistry.register_lazy(entry)
+            return
+
+        for module in modules:
+            importlib.import_module(f"{self.package}.{module}")
+        self.save(fingerprint)
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, fingerprint):
+        effects = []
+        for effect in EffectRegistry.list_effects():
+            entry = dict(effect)
+            entry["module"] = EffectRegistry.get_effect(effect["selector"]).__module__
+            effects.append(entry)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump({"fingerprint": fingerprint, "effects": effects}, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Error saving effect manifest: {e}")
@@ -1,30 +1,70 @@
 # registry/effect_registry.py
+import importlib
+import threading
+
+
 class EffectRegistry:
     """
     Singleton registry for all effects.
+
+    Effects known from the effect manifest are registered lazily: only their
+    description is kept until the effect is first requested, which imports
+    its module (registering the class through its decorator). A lazy import
+    may run on the effect-builder thread while another thread lists the
+    effects, so both dicts are only touched under ``_lock``.
     """
     _registry = {}
+    _lazy = {}  # selector -> manifest entry of an effect whose module is not imported yet
+    _lock = threading.Lock()
 
     @classmethod
     def register(cls, selector, effect_class):
-        if selector in cls._registry:
-            raise ValueError(f"Effect with selector '{selector}' is already registered.")
-        cls._registry[selector] = effect_class
+        with cls._lock:
+            if selector in cls._registry:
+                raise ValueError(f"Effect with selector '{selector}' is already registered.")
+            cls._registry[selector] = effect_class
+            cls._lazy.pop(selector, None)
+
+    @classmethod
+    def register_lazy(cls, entry):
+        """
+        Register an effect by its manifest entry (selector, name, module, default_config, schema).
+        """
+        with cls._lock:
+            if entry["selector"] not in cls._registry:
+                cls._lazy[entry["selector"]] = entry
 
     @classmethod
     def get_effect(cls, selector):
-        return cls._registry.get(selector, None)
+        with cls._lock:
+            entry = cls._lazy.get(selector) if selector not in cls._registry else None
+        if entry is not None:
+            # Outside the lock: the import registers the effect class
+            importlib.import_module(entry["module"])
+        with cls._lock:
+            return cls._registry.get(selector, None)
 
     @classmethod
     def list_effects(cls):
         """
-        Return a list of dicts, each containing 'selector', 'name', and 'default_config'.
+        Return a list of dicts, each containing 'selector', 'name', 'default_config' and the parameter 'schema'.
         """
+        with cls._lock:
+            registered = list(cls._registry.items())
+            lazy = list(cls._lazy.items())
         results = []
-        for selector, effect_cls in cls._registry.items():
+        for selector, effect_cls in registered:
             results.append({
                 "selector": selector,
                 "name": getattr(effect_cls, "name", selector),
-                "default_config": effect_cls.default_config
+                "default_config": effect_cls.default_config,
+                "schema": effect_cls.config_schema.describe() if effect_cls.config_schema else {}
+            })
+        for selector, entry in lazy:
+            results.append({
+                "selector": selector,
+                "name": entry["name"],
+                "default_config": entry["default_config"],
+                "schema": entry["schema"]
             })
         return results
@@ -0,0 +1,140 @@
+# render.py
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from controllers.led_controller import LEDController
+from controllers.effect_controller import EffectController
+from recording.frame_recorder import FrameRecorder
+from geometry.coord_store import CoordStore
+
+with redirect_stdout(sys.stderr):
+    import utils.register_effects
+
+DEFAULT_FRAMES = 300
+
+_coords = None
+
+
+def parse_job(spec):
+    """
+    Parses a job spec of the form ``selector`` or ``selector:{"json": "config"}``.
+    """
+    selector, _, config = spec.partition(":")
+    return {"effect": selector.lower(), "config": json.loads(config) if config else {}}
+
+
+def output_path(output_dir, job, index, file_format):
+    return os.path.join(output_dir, job.get("output") or f"{index:03d}-{job['effect']}.{file_format}")
+
+
+def _init_worker(coords):
+    global _coords
+    _coords = coords
+
+
+def render_job(job):
+    """
+    Renders one effect and config offline, as fast as possible, into a recording or ``.npy`` file.
+    :param job: Dict with effect, config, path, frames, fps, format, compression, color_order and seed.
+    """
+    random.seed(job["seed"])
+    np.random.seed(job["seed"])
+    controller = LEDController(_coords, pixel_count=len(_coords), drymode=True, fps=None,
+                               color_order=job["color_order"])
+    effect_controller = EffectController(controller)
+    try:
+        with redirect_stdout(sys.stderr):
+            effect_controller.change_effect(job["effect"], **job["config"])
+    finally:
+        effect_controller.close()  # Jobs use no saved defaults, so no config store is left behind
+    effect = controller.effect
+
+    frame_count = job["frames"]
+    os.makedirs(os.path.dirname(job["path"]) or ".", exist_ok=True)
+    start = time.perf_counter()
+    if job["format"] == "npy":
+        frames = np.lib.format.open_memmap(job["path"], mode="w+", dtype=np.uint8,
+                                           shape=(frame_count, len(_coords), 3))
+        for i in range(frame_count):
+            effect.render(effect.frame)
+            frames[i] = effect.frame
+        frames.flush()
+        del frames
+    else:
+        with FrameRecorder(job["path"], len(_coords), job["fps"], color_order=job["color_order"],
+                           compression=job["compression"]) as recorder:
+            for _ in range(frame_count):
+                effect.render(effect.frame)
+                recorder.write(effect.frame)
+    elapsed = time.perf_counter() - start
+
+    print(f"Rendered {job['effect']} to {job['path']}", file=sys.stderr)
+    return {
+        "effect": job["effect"],
+        "config": job["config"],
+        "output": job["path"],
+        "frames": frame_count,
+        "bytes": os.path.getsize(job["path"]),
+        "render_fps": round(frame_count / elapsed, 2) if elapsed > 0 else None,
+        "realtime_factor": round(frame_count / elapsed / job["fps"], 2) if elapsed > 0 else None,
+    }
+
+
+def run(jobs, coords, workers):
+    """
+    Renders all jobs, in a process pool if ``workers`` > 1.
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        _init_worker(coords)
+        return [render_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(coords,)) as pool:
+        return list(pool.map(render_job, jobs))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline LED effect renderer")
+    parser.add_argument('jobs', nargs='*', help='Effects to render, as selector or selector:{"json": "config"}')
+    parser.add_argument('--jobs-file', help='JSON list of {"effect", "config", "output"} jobs')
+    parser.add_argument('--frames', type=int, help=f"Frames to render per job (default: {DEFAULT_FRAMES})")
+    parser.add_argument('--seconds', type=float, help="Seconds to render per job, at --fps")
+    parser.add_argument('--fps', type=float, default=30)
+    parser.add_argument('--format', choices=["rec", "npy"], default="rec")
+    parser.add_argument('--compression', choices=["none", "delta", "rle"], default="delta")
+    parser.add_argument('--output-dir', default="renders")
+    parser.add_argument('--coords', help="Coordinates JSON file (default: coords.json)")
+    parser.add_argument('--leds', type=int, help="Render on a synthetic tree with this many LEDs instead")
+    parser.add_argument('--color-order', default="BRG")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    jobs = [parse_job(spec) for spec in args.jobs]
+    if args.jobs_file:
+        with open(args.jobs_file) as f:
+            jobs.extend(json.load(f))
+    if not jobs:
+        parser.error("no jobs given")
+
+    if args.leds:
+        from benchmark import synthetic_tree
+        coords = synthetic_tree(args.leds)
+    else:
+        coords = CoordStore(sources=(args.coords,) if args.coords else CoordStore.SOURCES).load()
+
+    frame_count = args.frames or (math.ceil(args.seconds * args.fps) if args.seconds else DEFAULT_FRAMES)
+    for index, job in enumerate(jobs):
+        job.setdefault("config", {})
+        job.update(path=output_path(args.output_dir, job, index, args.format), frames=frame_count, fps=args.fps,
+                   format=args.format, compression=args.compression, color_order=args.color_order, seed=args.seed)
+
+    results = run(jobs, coords, args.workers)
+    print(json.dumps({"leds": len(coords), "results": results}, indent=2))
@@ -0,0 +1,166 @@
+import json
+import math
+
+
+class Parameter:
+    """
+    Type and range of one effect parameter. The default comes from the effect's ``default_config``.
+    """
+    TYPES = ("float", "int", "bool", "color", "string")
+
+    def __init__(self, type, minimum=None, maximum=None):
+        """
+        :param type: One of TYPES. Colors are (r, g, b) tuples of ints in [0, 255].
+        :param minimum: Smallest allowed value of a number, inclusive.
+        :param maximum: Largest allowed value of a number, inclusive.
+        """
+        if type not in self.TYPES:
+            raise ValueError(f"Unknown parameter type: {type}")
+        self.type = type
+        self.minimum = minimum
+        self.maximum = maximum
+
+    @classmethod
+    def infer(cls, default):
+        """
+        Parameter for a config value that has no declared parameter, typed after its default.
+        """
+        if isinstance(default, bool):
+            return cls("bool")
+        if isinstance(default, int):
+            return cls("int")
+        if isinstance(default, float):
+            return cls("float")
+        if isinstance(default, (tuple, list)) and len(default) == 3:
+            return cls("color")
+        return cls("string")
+
+    def compile(self, key):
+        """
+        Build the function converting a raw config value (e.g. from JSON) to this parameter's type.
+        """
+        convert = getattr(self, f"_to_{self.type}")
+        minimum, maximum = self.minimum, self.maximum
+
+        def converter(value):
+            try:
+                value = convert(value)
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Invalid value for '{key}': {value!r}") from e
+            if minimum is not None and value < minimum:
+                raise ValueError(f"'{key}' must be at least {minimum}, got {value}")
+            if maximum is not None and value > maximum:
+                raise ValueError(f"'{key}' must be at most {maximum}, got {value}")
+            return value
+
+        return converter
+
+    def describe(self, default):
+        description = {"type": self.type, "default": list(default) if self.type == "color" else default}
+        if self.minimum is not None:
+            description["min"] = self.minimum
+        if self.maximum is not None:
+            description["max"] = self.maximum
+        return description
+
+    @staticmethod
+    def _to_float(value):
+        if isinstance(value, bool):
+            raise TypeError("Expected a number")
+        value = float(value)
+        if not math.isfinite(value):
+            raise ValueError("Expected a finite number")
+        return value
+
+    @staticmethod
+    def _to_int(value):
+        number = Parameter._to_float(value)
+        if not number.is_integer():
+            raise ValueError("Expected an integer")
+        return int(number)
+
+    @staticmethod
+    def _to_bool(value):
+        if isinstance(value, str):
+            if value.lower() in ("true", "1", "yes", "on"):
+                return True
+            if value.lower() in ("false", "0", "no", "off"):
+                return False
+            raise ValueError("Expected a boolean")
+        return bool(value)
+
+    @staticmethod
+    def _to_color(value):
+        if isinstance(value, str):
+            text = value.strip()
+            if text.startswith("#") and len(text) == 7:
+                return tuple(int(text[i:i + 2], 16) for i in (1, 3, 5))
+            # Older clients send colors as JSON arrays inside strings, or as "r, g, b"
+            value = json.loads(text) if text.startswith("[") else text.split(",")
+        color = tuple(int(round(Parameter._to_float(channel))) for channel in value)
+        if len(color) != 3 or not all(0 <= channel <= 255 for channel in color):
+            raise ValueError("Expected three channels in [0, 255]")
+        return color
+
+    @staticmethod
+    def _to_string(value):
+        if not isinstance(value, str):
+            raise TypeError("Expected a string")
+        return value
+
+
+class ConfigSchema:
+    """
+    Compiled parameter schema of an effect.
+
+    Built once per effect class at registration: every key of the effect's
+    ``default_config`` gets a converter from its declared ``Parameter`` (or
+    one inferred from the default), and the defaults themselves are
+    converted once. Resolving a config is then a single pass over the keys.
+    """
+
+    def __init__(self, default_config, parameters=None):
+        """
+        :param default_config: Default value of every parameter.
+        :param parameters: Declared Parameter per key; undeclared keys are typed after their default.
+        """
+        default_config = default_config or {}
+        parameters = parameters or {}
+        unknown = set(parameters) - set(default_config)
+        if unknown:
+            raise ValueError(f"Parameters without a default: {', '.join(sorted(unknown))}")
+        self.parameters = {key: parameters.get(key) or Parameter.infer(default)
+                           for key, default in default_config.items()}
+        self.converters = {key: parameter.compile(key) for key, parameter in self.parameters.items()}
+        self.defaults = {key: self.converters[key](default) for key, default in default_config.items()}
+
+    def __contains__(self, key):
+        return key in self.converters
+
+    def resolve(self, config):
+        """
+        Values of all parameters: the converted value from ``config`` where given, else the default.
+        Keys of ``config`` that are not parameters are ignored.
+        """
+        values = dict(self.defaults)
+        for key, converter in self.converters.items():
+            if key in config:
+                values[key] = converter(config[key])
+        return values
+
+    def validate(self, changes):
+        """
+        Convert a partial config, e.g. a live update. Unknown keys are rejected.
+        """
+        values = {}
+        for key, value in changes.items():
+            if key not in self.converters:
+                raise ValueError(f"Unknown parameter '{key}'")
+            values[key] = self.converters[key](value)
+        return values
+
+    def describe(self):
+        """
+        JSON-serializable description of every parameter, for UIs.
+        """
+        return {key: parameter.describe(self.defaults[key]) for key, parameter in self.parameters.items()}
@@ -0,0 +1,86 @@
+# startup_benchmark.py
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+MANIFEST_PATH = "cache/effects_manifest.json"
+
+
+def child(effect, eager):
+    """
+    Runs the startup path of main.py (without MQTT) and reports when the first lit frame was shown.
+    """
+    from contextlib import redirect_stdout
+    with redirect_stdout(sys.stderr):
+        from utils.load_coords import load_coords
+        from controllers.led_controller import LEDController
+        from controllers.effect_controller import EffectController
+        if eager:
+            import importlib
+            from registry.effect_manifest import EffectManifest
+            for module in EffectManifest().modules():
+                importlib.import_module(f"effects.{module}")
+        import utils.register_effects
+    imports_done = time.time()
+
+    with redirect_stdout(sys.stderr):
+        coords = load_coords()
+        controller = LEDController(coords, pixel_count=len(coords), drymode=True)
+        effect_controller = EffectController(controller, background=True)
+        effect_controller.change_effect(effect)
+        controller.start()
+        sequence = 0
+        while True:
+            sequence, frame = controller.frames.latest(since=sequence)
+            if frame is not None and frame.any():
+                break
+            time.sleep(0.0005)
+        lit = time.time()
+        controller.stop()
+    print(json.dumps({"imports": imports_done, "first_lit_frame": lit}))
+
+
+def run_once(effect, eager, cold):
+    if cold and os.path.exists(MANIFEST_PATH):
+        os.remove(MANIFEST_PATH)
+    command = [sys.executable, os.path.abspath(__file__), "--child", "--effect", effect]
+    if eager:
+        command.append("--eager")
+    launched = time.time()
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    data = json.loads(result.stdout.strip().splitlines()[-1])
+    return {key: value - launched for key, value in data.items()}
+
+
+def summarize(samples):
+    return {
+        key: {
+            "median_ms": round(statistics.median(sample[key] for sample in samples) * 1000, 1),
+            "max_ms": round(max(sample[key] for sample in samples) * 1000, 1),
+        }
+        for key in samples[0]
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures the time from process start to the first lit frame")
+    parser.add_argument('--effect', default="wave")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--eager', action='store_true', help="Import all effect modules up front, for comparison")
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.effect, args.eager)
+        sys.exit(0)
+
+    report = {"effect": args.effect, "runs": args.runs}
+    for name, eager, cold in (("cold_manifest", False, True), ("warm_manifest", False, False),
+                              ("eager_imports", True, False)):
+        print(f"Measuring {name}", file=sys.stderr)
+        report[name] = summarize([run_once(args.effect, eager, cold) for _ in range(args.runs)])
+    print(json.dumps(report, indent=2))
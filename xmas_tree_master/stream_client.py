@@ -0,0 +1,99 @@
+# stream_client.py
+import json
+import time
+import argparse
+
+from controllers.pixel_buffer import PixelBuffer
+from outputs.color_pipeline import ColorPipeline
+from streaming.frame_receiver import FrameReceiver
+from utils.open_stream_transport import open_stream_transport
+
+
+class StreamClient:
+    """
+    Thin tree client: shows the frames a master streams, without an effect engine.
+
+    Only decodes the frames, applies this tree's brightness, gamma and white
+    balance and writes them to the strip. The strip is set up once the first
+    frame tells the LED count.
+    """
+
+    def __init__(self, receiver, drymode, color_order="BRG", brightness=0.5, gamma=(1.0, 1.0, 1.0),
+                 white_balance=(1.0, 1.0, 1.0)):
+        """
+        :param receiver: FrameReceiver of the stream.
+        :param drymode: Do not drive a strip, only decode the frames.
+        :param color_order: Channel order the strip expects.
+        """
+        self.receiver = receiver
+        self.drymode = drymode
+        self.color_order = color_order
+        self.brightness = brightness
+        self.gamma = gamma
+        self.white_balance = white_balance
+        self.pixels = None
+        self.color_pipeline = None
+        self.output = None
+
+    def _setup(self, pixel_count):
+        self.pixels = PixelBuffer(pixel_count, self.color_order)
+        self.color_pipeline = ColorPipeline(pixel_count, self.brightness, self.gamma, self.white_balance)
+        if not self.drymode and self.output is None:
+            from outputs.neopixel_output import NeoPixelOutput
+            self.output = NeoPixelOutput(pixel_count)
+        print(f"Receiving a stream of {pixel_count} LEDs")
+
+    def show(self, frame):
+        if self.pixels is None or len(self.pixels) != len(frame):
+            self._setup(len(frame))
+        if self.output is not None:
+            corrected = self.color_pipeline.apply(frame)
+            self.output.show(self.pixels.device_frame(corrected))
+
+    def run(self, stats_interval=10):
+        """
+        Show frames as they become due until interrupted.
+        """
+        next_stats = time.monotonic() + stats_interval
+        while True:
+            frame = self.receiver.next_frame(timeout=1.0)
+            if frame is not None:
+                self.show(frame)
+            if time.monotonic() >= next_stats:
+                print(json.dumps(self.receiver.summary()))
+                next_stats += stats_interval
+
+
+if __name__ == "__main__":
+    with open("configs/config_master.json") as f:
+        config_data = json.load(f)
+
+    parser = argparse.ArgumentParser(description="Thin client showing frames streamed by a master")
+    parser.add_argument("source", help="Stream to receive: udp://host:port to listen on, or mqtt://topic")
+    parser.add_argument('--latency', type=float, default=0.1, help="Seconds of playout buffer against jitter")
+    parser.add_argument('--dry', action=argparse.BooleanOptionalAction)
+    parser.add_argument('--stats-interval', type=float, default=config_data.get("stats_interval", 10))
+    args = parser.parse_args()
+
+    mqtt_client = None
+    if args.source.startswith("mqtt://"):
+        import paho.mqtt.client as mqtt
+        mqtt_client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2, clean_session=True)
+        mqtt_client.connect(config_data.get("mqtt_broker", "fancyguysdev.de"))
+        mqtt_client.loop_start()
+
+    receiver = FrameReceiver(open_stream_transport(args.source, mqtt_client, receive=True), latency=args.latency)
+    client = StreamClient(receiver, drymode=(args.dry or False),
+                          color_order=config_data.get("color_order", "BRG"),
+                          brightness=config_data.get("brightness", 0.5),
+                          gamma=config_data.get("gamma", (1.0, 1.0, 1.0)),
+                          white_balance=config_data.get("white_balance", (1.0, 1.0, 1.0)))
+    try:
+        client.run(args.stats_interval)
+    except KeyboardInterrupt:
+        print("Stopping...")
+    finally:
+        receiver.close()
+        if mqtt_client is not None:
+            mqtt_client.loop_stop()
+            mqtt_client.disconnect()
@@ -0,0 +1,55 @@
+import queue
+
+
+class BrokerTransport:
+    """
+    Sends or receives frame packets over a publish/subscribe broker topic.
+
+    Works with a paho MQTT client or with a LocalBroker, which offers the
+    same calls. Packets are published with QoS 0: a lost packet is recovered
+    by the next keyframe rather than resent late.
+    """
+
+    def __init__(self, client, topic, receive=False, max_pending=64):
+        """
+        :param client: Connected paho MQTT client or LocalBroker.
+        :param topic: Topic the packets are published on.
+        :param receive: Subscribe to the topic to receive packets.
+        :param max_pending: Received packets kept until read; the oldest are dropped beyond that.
+        """
+        self.client = client
+        self.topic = topic
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.receiving = receive
+        if receive:
+            client.message_callback_add(topic, self._on_message)
+            client.subscribe(topic)
+
+    def _on_message(self, client, userdata, message):
+        while True:
+            try:
+                self.pending.put_nowait(bytes(message.payload))
+                return
+            except queue.Full:
+                try:
+                    self.pending.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def send(self, data):
+        self.client.publish(self.topic, data, qos=0)
+
+    def receive(self, timeout=None):
+        """
+        Wait for the next packet.
+        :return: The packet, or None after ``timeout`` seconds.
+        """
+        try:
+            return self.pending.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        if self.receiving:
+            self.client.message_callback_remove(self.topic)
+            self.client.unsubscribe(self.topic)
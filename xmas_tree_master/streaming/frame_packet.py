@@ -0,0 +1,39 @@
+import struct
+
+from recording import frame_codec
+
+# Packet header: magic, version, frame type, stream id, sequence number, base sequence, timestamp, LED count
+MAGIC = b"XMFS"
+VERSION = 1
+HEADER = struct.Struct("<4sBB2xIIIdI")
+
+
+def pack(frame_type, payload, stream, sequence, base, timestamp, led_count):
+    """
+    Build one frame packet.
+    :param frame_type: Record type of the payload, see recording.frame_codec.
+    :param payload: Encoded frame.
+    :param stream: Id of the sending stream; it changes when the master restarts.
+    :param sequence: Sequence number of the frame within the stream.
+    :param base: Sequence number of the frame a delta applies to (equal to ``sequence`` for keyframes).
+    :param timestamp: Time at which the master showed the frame, in seconds.
+    :param led_count: Number of LEDs per frame.
+    """
+    return HEADER.pack(MAGIC, VERSION, frame_type, stream, sequence, base, timestamp, led_count) + payload
+
+
+def unpack(data):
+    """
+    Split a frame packet into its header fields and payload.
+    :return: Tuple of (frame_type, stream, sequence, base, timestamp, led_count, payload).
+    """
+    if len(data) < HEADER.size:
+        raise ValueError(f"Packet too short: {len(data)} bytes")
+    magic, version, frame_type, stream, sequence, base, timestamp, led_count = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a frame packet")
+    return frame_type, stream, sequence, base, timestamp, led_count, memoryview(data)[HEADER.size:]
+
+
+def is_keyframe(frame_type):
+    return frame_type in frame_codec.KEYFRAME_TYPES
@@ -0,0 +1,168 @@
+import heapq
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from recording import frame_codec
+from streaming import frame_packet
+
+
+class FrameReceiver:
+    """
+    Receives a frame stream and plays it out in the master's timing.
+
+    Packets are kept in a small playout buffer ordered by sequence number.
+    A frame is due ``latency`` seconds after the master showed it, measured
+    against the smallest transit time seen recently (so the clocks of the
+    master and the client need not agree). The buffer absorbs jitter and
+    reorders packets that arrive out of order.
+
+    Deltas apply on top of the keyframe they were encoded against; while
+    that keyframe is missing, the last good frame stays up until the next
+    keyframe arrives.
+    """
+
+    def __init__(self, transport, latency=0.1, max_buffered=64, offset_window=256, clock=time.monotonic):
+        """
+        :param transport: Transport the packets arrive on (UDPTransport or BrokerTransport).
+        :param latency: Seconds a frame is held back to absorb jitter.
+        :param max_buffered: Packets kept in the playout buffer; the oldest are dropped beyond that.
+        :param offset_window: Number of recent packets the transit time estimate looks at.
+        :param clock: Local clock frames are scheduled on.
+        """
+        self.transport = transport
+        self.latency = latency
+        self.max_buffered = max_buffered
+        self.clock = clock
+        self.condition = threading.Condition()
+        self.buffer = []  # Heap of (sequence, timestamp, frame type, base, payload)
+        self.offsets = deque(maxlen=offset_window)  # Local arrival time minus master timestamp
+        self.stream = None
+        self.led_count = None
+        self.frame = None
+        self.sequence = None  # Sequence number of self.frame
+        self.reference = None  # The last keyframe, which deltas apply to
+        self.reference_sequence = None
+        self.played = None  # Highest sequence number taken out of the buffer
+        self.highest = None  # Highest sequence number received
+        self.received = 0
+        self.lost = 0
+        self.late = 0
+        self.skipped = 0
+        self.shown = 0
+        self.running = True
+        self.thread = threading.Thread(target=self._receive, daemon=True)
+        self.thread.start()
+
+    def _receive(self):
+        while self.running:
+            data = self.transport.receive(timeout=0.5)
+            if data is None:
+                continue
+            arrival = self.clock()
+            try:
+                frame_type, stream, sequence, base, timestamp, led_count, payload = frame_packet.unpack(data)
+            except ValueError as e:
+                print(f"Ignoring packet: {e}")
+                continue
+            with self.condition:
+                if stream != self.stream:
+                    self._reset(stream, led_count)
+                self.received += 1
+                self.offsets.append(arrival - timestamp)
+                if self.played is not None and sequence <= self.played:
+                    self.late += 1  # Its turn has passed already
+                    continue
+                if self.highest is not None and sequence > self.highest + 1:
+                    self.lost += sequence - self.highest - 1  # Counted back if a missing packet arrives late
+                elif self.highest is not None and sequence <= self.highest:
+                    self.lost -= 1
+                self.highest = sequence if self.highest is None else max(self.highest, sequence)
+                heapq.heappush(self.buffer, (sequence, timestamp, frame_type, base, bytes(payload)))
+                if len(self.buffer) > self.max_buffered:
+                    self._play(heapq.heappop(self.buffer))
+                self.condition.notify()
+
+    def _reset(self, stream, led_count):
+        """
+        Start over for a new stream, e.g. after the master restarted.
+        """
+        self.stream = stream
+        self.led_count = led_count
+        self.frame = np.zeros((led_count, 3), dtype=np.uint8)
+        self.sequence = None
+        self.reference = np.zeros((led_count, 3), dtype=np.uint8)
+        self.reference_sequence = None
+        self.played = None
+        self.highest = None
+        self.buffer = []
+        self.offsets.clear()
+
+    def _play(self, packet):
+        """
+        Apply a packet taken out of the buffer to the current frame.
+        """
+        sequence, _, frame_type, base, payload = packet
+        self.played = sequence
+        keyframe = frame_packet.is_keyframe(frame_type)
+        if not keyframe and self.reference_sequence != base:
+            self.skipped += 1  # Its keyframe was lost; wait for the next one
+            return False
+        try:
+            frame_codec.decode(frame_type, payload, self.led_count, previous=self.reference, out=self.frame)
+        except ValueError as e:
+            print(f"Error decoding frame {sequence}: {e}")
+            self.skipped += 1
+            return False
+        if keyframe:
+            self.reference[:] = self.frame
+            self.reference_sequence = sequence
+        self.sequence = sequence
+        return True
+
+    def next_frame(self, timeout=None):
+        """
+        Wait until the next frame is due.
+        Frames that became due meanwhile are applied too, so a late consumer catches up instead of lagging.
+        :return: The current (N, 3) uint8 frame (a copy), or None if no frame was due within ``timeout`` seconds.
+        """
+        deadline = None if timeout is None else self.clock() + timeout
+        with self.condition:
+            while True:
+                now = self.clock()
+                if self.buffer:
+                    due = self.buffer[0][1] + min(self.offsets) + self.latency
+                    if due <= now:
+                        updated = False
+                        while self.buffer and self.buffer[0][1] + min(self.offsets) + self.latency <= now:
+                            updated = self._play(heapq.heappop(self.buffer)) or updated
+                        if updated:
+                            self.shown += 1
+                            return self.frame.copy()
+                        continue
+                    wait = due - now
+                else:
+                    wait = None
+                if deadline is not None:
+                    if now >= deadline:
+                        return None
+                    wait = deadline - now if wait is None else min(wait, deadline - now)
+                self.condition.wait(wait)
+
+    def summary(self):
+        with self.condition:
+            return {
+                "received": self.received,
+                "lost": self.lost,
+                "late": self.late,
+                "skipped": self.skipped,
+                "shown": self.shown,
+                "buffered": len(self.buffer),
+            }
+
+    def close(self):
+        self.running = False
+        self.thread.join()
+        self.transport.close()
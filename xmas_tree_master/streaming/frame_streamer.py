@@ -0,0 +1,109 @@
+import os
+import time
+import threading
+
+import numpy as np
+
+from recording import frame_codec
+from streaming import frame_packet
+
+
+class FrameStreamer:
+    """
+    Publishes rendered frames as compact binary packets to thin clients.
+
+    Every frame becomes one packet with a sequence number, the time it was
+    shown and the LED count. The payload is compressed like a recording:
+
+    * ``"none"``: every frame raw (N * 3 bytes).
+    * ``"delta"``: only the LEDs that differ from the last keyframe, with a
+      keyframe every ``keyframe_interval`` frames. As every delta refers to
+      the keyframe rather than to the previous frame, a lost packet costs
+      only its own frame.
+    * ``"rle"``: every frame as runs of equal colors, each one a keyframe.
+
+    Keyframes are sent run-length encoded when that is smaller than raw.
+    Frames are (r, g, b) before brightness and gamma; each client applies
+    its own color pipeline.
+    """
+
+    def __init__(self, transport, led_count, fps, compression="delta", keyframe_interval=None, clock=time.time):
+        """
+        :param transport: Transport the packets are sent over (UDPTransport or BrokerTransport).
+        :param led_count: Number of LEDs per frame.
+        :param fps: Frame rate of the render loop.
+        :param compression: "none", "delta" or "rle".
+        :param keyframe_interval: Frames between keyframes for delta compression; one second by default.
+        :param clock: Clock of the packet timestamps.
+        """
+        if compression not in frame_codec.COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        self.transport = transport
+        self.led_count = led_count
+        self.compression = compression
+        self.keyframe_interval = keyframe_interval or max(int(fps or 30), 1)
+        self.clock = clock
+        self.stream = int.from_bytes(os.urandom(4), "little")
+        self.sequence = 0
+        self.reference = np.zeros((led_count, 3), dtype=np.uint8)  # The last keyframe, deltas are encoded against it
+        self.reference_sequence = None
+        self.since_keyframe = None  # Frames sent since the last keyframe; None until the first one
+        self.packets = 0
+        self.keyframes = 0
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+
+    def write(self, frame):
+        """
+        Encode and send one frame.
+        """
+        with self.lock:
+            self.sequence = (self.sequence + 1) & 0xFFFFFFFF
+            base = self.sequence
+            frame_type, payload = self._encode_keyframe(frame) if self._keyframe_due() else (None, None)
+            if frame_type is None:
+                payload = frame_codec.encode_delta(frame, self.reference)
+                if len(payload) < self.led_count * 3:
+                    frame_type = frame_codec.DELTA
+                    base = self.reference_sequence
+                else:
+                    frame_type, payload = self._encode_keyframe(frame)  # Too much changed: start over
+            if frame_packet.is_keyframe(frame_type):
+                self.reference[:] = frame
+                self.reference_sequence = self.sequence
+                self.since_keyframe = 0
+                self.keyframes += 1
+            else:
+                self.since_keyframe += 1
+
+            packet = frame_packet.pack(frame_type, payload, self.stream, self.sequence, base, self.clock(),
+                                       self.led_count)
+            try:
+                self.transport.send(packet)
+            except (OSError, ValueError) as e:
+                print(f"Error streaming frame: {e}")
+                return
+            self.packets += 1
+            self.bytes_sent += len(packet)
+
+    def _keyframe_due(self):
+        return (self.compression != "delta" or self.since_keyframe is None or
+                self.since_keyframe + 1 >= self.keyframe_interval)
+
+    def _encode_keyframe(self, frame):
+        if self.compression != "none":
+            payload = frame_codec.encode_rle(frame)
+            if len(payload) < self.led_count * 3:
+                return frame_codec.RLE, payload
+        return frame_codec.RAW, frame_codec.encode_raw(frame)
+
+    def summary(self):
+        return {
+            "packets": self.packets,
+            "keyframes": self.keyframes,
+            "bytes": self.bytes_sent,
+            "bytes_per_frame": round(self.bytes_sent / self.packets, 1) if self.packets else None,
+        }
+
+    def close(self):
+        self.transport.close()
@@ -0,0 +1,76 @@
+import heapq
+import random
+import threading
+import time
+from types import SimpleNamespace
+
+
+class LocalBroker:
+    """
+    In-process stand-in for an MQTT broker and client, to run streams offline.
+
+    Offers the calls of a paho client that BrokerTransport uses. Messages can
+    be dropped at random and delayed by a random jitter to try out how
+    clients cope with a lossy network.
+    """
+
+    def __init__(self, loss=0.0, delay=0.0, jitter=0.0, seed=None):
+        """
+        :param loss: Probability that a message is dropped.
+        :param delay: Fixed delivery delay in seconds.
+        :param jitter: Maximum extra random delay in seconds; messages can arrive out of order.
+        :param seed: Seed of the loss and jitter randomness.
+        """
+        self.loss = loss
+        self.delay = delay
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.callbacks = {}
+        self.lock = threading.Condition()
+        self.scheduled = []  # Heap of (delivery time, order, topic, payload)
+        self.order = 0
+        self.published = 0
+        self.dropped = 0
+        if delay or jitter:
+            threading.Thread(target=self._deliver_scheduled, daemon=True).start()
+
+    def message_callback_add(self, topic, callback):
+        with self.lock:
+            self.callbacks[topic] = callback
+
+    def message_callback_remove(self, topic):
+        with self.lock:
+            self.callbacks.pop(topic, None)
+
+    def subscribe(self, topic):
+        pass
+
+    def unsubscribe(self, topic):
+        pass
+
+    def publish(self, topic, payload, qos=0):
+        with self.lock:
+            self.published += 1
+            if self.random.random() < self.loss:
+                self.dropped += 1
+                return
+            if not (self.delay or self.jitter):
+                callback = self.callbacks.get(topic)
+            else:
+                deliver_at = time.monotonic() + self.delay + self.random.uniform(0, self.jitter)
+                heapq.heappush(self.scheduled, (deliver_at, self.order, topic, bytes(payload)))
+                self.order += 1
+                self.lock.notify()
+                return
+        if callback is not None:
+            callback(self, None, SimpleNamespace(topic=topic, payload=bytes(payload)))
+
+    def _deliver_scheduled(self):
+        while True:
+            with self.lock:
+                while not self.scheduled or self.scheduled[0][0] > time.monotonic():
+                    self.lock.wait(self.scheduled[0][0] - time.monotonic() if self.scheduled else None)
+                _, _, topic, payload = heapq.heappop(self.scheduled)
+                callback = self.callbacks.get(topic)
+            if callback is not None:
+                callback(self, None, SimpleNamespace(topic=topic, payload=payload))
@@ -0,0 +1,51 @@
+import socket
+
+MAX_DATAGRAM = 65507
+
+
+def parse_address(address, default_host=""):
+    """
+    Parse "host:port" (or just "port") into a (host, port) tuple.
+    """
+    host, _, port = str(address).rpartition(":")
+    return host or default_host, int(port)
+
+
+class UDPTransport:
+    """
+    Sends or receives frame packets as plain UDP datagrams, one packet per datagram.
+
+    Frames must fit in one datagram, i.e. up to about 21 000 LEDs uncompressed.
+    """
+
+    def __init__(self, address=None, bind=None):
+        """
+        :param address: (host, port) to send packets to; a broadcast address reaches all clients in the network.
+        :param bind: (host, port) to receive packets on.
+        """
+        self.address = address
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        if bind is not None:
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.socket.bind(bind)
+
+    def send(self, data):
+        if len(data) > MAX_DATAGRAM:
+            raise ValueError(f"Packet of {len(data)} bytes does not fit in a datagram")
+        self.socket.sendto(data, self.address)
+
+    def receive(self, timeout=None):
+        """
+        Wait for the next packet.
+        :return: The packet, or None after ``timeout`` seconds.
+        """
+        self.socket.settimeout(timeout)
+        try:
+            data, _ = self.socket.recvfrom(MAX_DATAGRAM)
+        except socket.timeout:
+            return None
+        return data
+
+    def close(self):
+        self.socket.close()
@@ -0,0 +1,39 @@
+import numpy as np
+
+from effects.color_gradient_effect import ColorGradientSweepEffect
+
+
+def make_effect(**config):
+    rng = np.random.default_rng(0)
+    coords = rng.uniform((-50, -50, 0), (50, 50, 200), size=(500, 3))
+    return ColorGradientSweepEffect(pixels=None, coords=coords, min_y=0.0, max_y=200.0, min_x=-50.0, max_x=50.0,
+                                    min_z=0.0, max_z=200.0, center=(0.0, 0.0, 100.0), **config)
+
+
+def test_speed_patch_keeps_plane_position():
+    effect = make_effect(speed=3)
+    frame = np.zeros((500, 3), dtype=np.uint8)
+    for _ in range(40):
+        effect.render(frame)
+    position = effect.plane_pos
+
+    effect.update_config(speed=0.1)
+    assert effect.plane_pos == position
+
+    effect.render(frame)
+    assert abs(effect.plane_pos - position) <= 0.1 + 1e-9
+
+
+def test_patch_keeps_sweeping_the_whole_tree():
+    effect = make_effect(speed=3)
+    frame = np.zeros((500, 3), dtype=np.uint8)
+    for _ in range(40):
+        effect.render(frame)
+    effect.update_config(speed=2, plane_height=10)
+
+    positions = []
+    for _ in range(2 * effect.cycle_frames()):
+        effect.render(frame)
+        positions.append(effect.plane_pos)
+    assert np.all(np.abs(np.diff(positions)) <= 2 + 1e-9)
+    assert min(positions) - 5 < 0 and max(positions) + 5 > 200
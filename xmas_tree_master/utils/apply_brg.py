@@ -1,5 +1,10 @@
 def apply_brg(color, brightness = 1 ):
-    """Adjusts color brightness and reorders to BRG."""
+    """
+    Adjusts color brightness and reorders to BRG.
+
+    Only for legacy code writing straight to a BRG strip driver; the pixel
+    buffer expects (r, g, b) and reorders on flush (see scale_color).
+    """
     r, g, b = color
     r, g, b = int(r * brightness), int(g * brightness), int(b * brightness)
     return b, r, g
\ No newline at end of file
@@ -1,5 +1,7 @@
 import json
 
 def get_tuple_from_json_array(x):
+    if isinstance(x, (list, tuple)):
+        return tuple(x)
     if x is not None:
         return tuple(json.loads(x))
\ No newline at end of file
@@ -0,0 +1,27 @@
+import numpy as np
+
+
+def hsv_to_rgb_array(h, s, v):
+    """
+    Vectorized colorsys.hsv_to_rgb.
+
+    :param h: Array of hues in [0, 1].
+    :param s: Saturation (scalar or array).
+    :param v: Value (scalar or array).
+    :return: (N, 3) float array of RGB values in [0, 1].
+    """
+    h = np.asarray(h, dtype=np.float32)
+    s = np.broadcast_to(np.asarray(s, dtype=np.float32), h.shape)
+    v = np.broadcast_to(np.asarray(v, dtype=np.float32), h.shape)
+
+    i = np.floor(h * 6.0)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i.astype(np.int32) % 6
+
+    r = np.choose(i, (v, q, p, p, t, v))
+    g = np.choose(i, (t, v, v, q, p, p))
+    b = np.choose(i, (p, p, t, v, v, q))
+    return np.stack((r, g, b), axis=-1)
@@ -1,10 +1,8 @@
-import json
+from geometry.coord_store import CoordStore
 
 def load_coords():
     """
-    Load coordinates from a JSON file.
+    Load coordinates through the binary coordinate store, which is regenerated when coords.json changes.
     """
-    with open("coords.json", "r") as file:
-        coords = json.load(file)
-    return [tuple(coord) for coord in coords]
+    return [tuple(coord) for coord in CoordStore().load().tolist()]
 
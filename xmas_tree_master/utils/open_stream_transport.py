@@ -0,0 +1,20 @@
+from streaming.udp_transport import UDPTransport, parse_address
+from streaming.broker_transport import BrokerTransport
+
+
+def open_stream_transport(url, mqtt_client=None, receive=False):
+    """
+    Open the transport of a frame stream.
+    :param url: "udp://host:port" (to send to, or to listen on) or "mqtt://topic".
+    :param mqtt_client: Connected MQTT client (or LocalBroker) for "mqtt://" streams.
+    :param receive: Open the transport for receiving instead of sending.
+    """
+    scheme, _, target = url.partition("://")
+    if scheme == "udp":
+        address = parse_address(target)
+        return UDPTransport(bind=address) if receive else UDPTransport(address=address)
+    if scheme == "mqtt":
+        if mqtt_client is None:
+            raise ValueError("An MQTT client is required for mqtt:// streams")
+        return BrokerTransport(mqtt_client, target, receive=receive)
+    raise ValueError(f"Unknown stream URL: {url}")
@@ -0,0 +1,13 @@
+import numpy as np
+
+
+def scale_color_array(color, brightness):
+    """
+    Scales one (r, g, b) color by an array of brightness values.
+
+    :param color: (r, g, b) color.
+    :param brightness: Array of N brightness values.
+    :return: (N, 3) uint8 array of (r, g, b) colors.
+    """
+    rgb = np.array(color, dtype=np.float32)
+    return np.clip(np.asarray(brightness, dtype=np.float32)[:, None] * rgb, 0, 255).astype(np.uint8)
@@ -0,0 +1,169 @@
+import os
+import time
+import socket
+import struct
+import asyncio
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+
+from visualizer.websocket import WebSocket
+
+# Binary messages to the browser: kind, 3 padding bytes, u4 count (coords) or sequence (frames), then the data
+MESSAGE_HEADER = struct.Struct("<B3xI")
+COORDS = 0  # (N, 3) float32 positions
+FRAME = 1  # (N, 3) uint8 (r, g, b) colors
+
+PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "index.html")
+
+
+class WebVisualizer:
+    """
+    Asyncio HTTP/WebSocket server that streams the rendered frames to browsers.
+
+    The page draws the 3D view itself: each viewer receives the coordinates
+    once, then raw uint8 frames. One poller takes the newest frame from the
+    frame mailbox and encodes it once per tick, no matter how many viewers
+    are connected (and not at all without viewers). Each viewer has its own
+    sender, throttled to the rate the viewer asked for; a viewer that is
+    still busy with an older frame skips straight to the newest one.
+    """
+
+    def __init__(self, frames, coords, host="0.0.0.0", port=8888, fps=30, title="3D LED Visualizer"):
+        """
+        :param frames: FrameMailbox the render loop publishes to.
+        :param coords: (N, 3) LED positions.
+        :param host: Address to listen on.
+        :param port: Port to listen on.
+        :param fps: Maximum rate at which frames are taken from the mailbox.
+        :param title: Title shown on the page.
+        """
+        self.frames = frames
+        self.host = host
+        self.port = port
+        self.fps = fps
+        self.title = title
+        positions = np.ascontiguousarray(coords, dtype=np.float32).reshape(-1, 3)
+        self.coords_message = MESSAGE_HEADER.pack(COORDS, len(positions)) + positions.tobytes()
+        self.frame_size = MESSAGE_HEADER.size + positions.size
+        self.sequence = 0
+        self.message = None  # Newest encoded frame, shared by all viewers
+        self.viewers = 0
+        self.new_frame = None
+        self.server = None
+
+    def run(self):
+        """
+        Serve until interrupted.
+        """
+        asyncio.run(self.serve())
+
+    async def serve(self):
+        self.new_frame = asyncio.Condition()
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        print(f"Visualizer running on http://{self.host}:{self.port}/")
+        poller = asyncio.create_task(self._poll())
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            poller.cancel()
+
+    async def _poll(self):
+        """
+        Take new frames from the mailbox while anyone is watching.
+        """
+        interval = 1 / self.fps
+        while True:
+            await asyncio.sleep(interval)
+            if not self.viewers:
+                continue
+            sequence, frame = self.frames.latest(since=self.sequence)
+            if frame is None:
+                continue
+            async with self.new_frame:
+                self.sequence = sequence
+                self.message = MESSAGE_HEADER.pack(FRAME, sequence) + frame.tobytes()
+                self.new_frame.notify_all()
+
+    async def _handle(self, reader, writer):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        lines = request.decode("latin-1").split("\r\n")
+        method, target, _ = (lines[0].split(" ") + ["", ""])[:3]
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        url = urlsplit(target)
+
+        if method != "GET":
+            await self._respond(writer, "405 Method Not Allowed", b"")
+        elif url.path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+            await self._stream(WebSocket(reader, writer), headers, parse_qs(url.query))
+        elif url.path in ("/", "/index.html"):
+            with open(PAGE, "rb") as f:
+                page = f.read().replace(b"{{title}}", self.title.encode("utf-8"))
+            await self._respond(writer, "200 OK", page, "text/html; charset=utf-8")
+        else:
+            await self._respond(writer, "404 Not Found", b"")
+
+    @staticmethod
+    async def _respond(writer, status, body, content_type="text/plain"):
+        writer.write((f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                      f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n").encode("ascii") + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _stream(self, websocket, headers, query):
+        """
+        Send the coordinates, then the newest frame whenever there is one, at most ``fps`` times per second.
+        :param query: Query parameters of the request; ``fps`` lowers the frame rate for this viewer.
+        """
+        try:
+            fps = min(float(query.get("fps", [self.fps])[0]), self.fps)
+        except ValueError:
+            fps = self.fps
+        interval = 1 / max(fps, 0.1)
+
+        await websocket.handshake(headers)
+        # Keep at most about two frames in flight, so a slow viewer's backlog is dropped here instead of queued
+        sock = websocket.writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, max(2 * self.frame_size, 4096))
+        websocket.writer.transport.set_write_buffer_limits(high=0)
+        receiver = asyncio.create_task(self._receive(websocket))
+        self.viewers += 1
+        try:
+            await websocket.send(self.coords_message)
+            sent = 0
+            while not websocket.closed:
+                async with self.new_frame:
+                    await self.new_frame.wait_for(lambda: self.sequence != sent or websocket.closed)
+                if websocket.closed:
+                    break
+                sent, message = self.sequence, self.message
+                due = time.monotonic() + interval
+                await websocket.send(message)  # Frames published meanwhile are skipped, not queued
+                await asyncio.sleep(max(0.0, due - time.monotonic()))
+        except ConnectionError:
+            pass
+        finally:
+            self.viewers -= 1
+            receiver.cancel()
+            await websocket.close()
+
+    async def _receive(self, websocket):
+        """
+        Answer pings and notice when the viewer goes away.
+        """
+        while await websocket.receive() is not None:
+            pass
+        async with self.new_frame:
+            self.new_frame.notify_all()  # Wake the sender so it can stop
@@ -0,0 +1,125 @@
+import base64
+import struct
+import hashlib
+import asyncio
+
+GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# Opcodes
+CONTINUATION = 0x0
+TEXT = 0x1
+BINARY = 0x2
+CLOSE = 0x8
+PING = 0x9
+PONG = 0xA
+
+MAX_MESSAGE = 1 << 16  # Viewers only send control messages and small texts
+
+
+class WebSocket:
+    """
+    Minimal server side of a WebSocket connection (RFC 6455) over asyncio streams.
+
+    Supports sending text and binary messages and receiving (unfragmented)
+    messages from the browser; pings are answered and a close is echoed.
+    """
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.closed = False
+
+    @staticmethod
+    def accept_key(key):
+        """
+        The Sec-WebSocket-Accept value for a client's Sec-WebSocket-Key.
+        """
+        return base64.b64encode(hashlib.sha1(key.encode("ascii") + GUID).digest()).decode("ascii")
+
+    async def handshake(self, headers):
+        """
+        Complete the opening handshake of an HTTP upgrade request.
+        :param headers: Request headers with lower-case names.
+        """
+        response = ("HTTP/1.1 101 Switching Protocols\r\n"
+                    "Upgrade: websocket\r\n"
+                    "Connection: Upgrade\r\n"
+                    f"Sec-WebSocket-Accept: {self.accept_key(headers['sec-websocket-key'])}\r\n\r\n")
+        self.writer.write(response.encode("ascii"))
+        await self.writer.drain()
+
+    async def send(self, data):
+        """
+        Send a message: bytes as a binary message, str as a text message.
+        Waits until the transport accepted the data, so a slow viewer holds up only its own sender.
+        """
+        if isinstance(data, str):
+            await self._send_frame(TEXT, data.encode("utf-8"))
+        else:
+            await self._send_frame(BINARY, data)
+
+    async def receive(self):
+        """
+        Wait for the next message from the browser.
+        :return: The message (str or bytes), or None once the connection is closed.
+        """
+        while not self.closed:
+            try:
+                opcode, payload = await self._read_frame()
+            except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+                self.closed = True
+                return None
+            if opcode == PING:
+                await self._send_frame(PONG, payload)
+            elif opcode == CLOSE:
+                await self.close(payload[:2] or b"\x03\xe8")
+            elif opcode == TEXT:
+                return payload.decode("utf-8")
+            elif opcode == BINARY:
+                return payload
+        return None
+
+    async def close(self, code=b"\x03\xe8"):
+        """
+        Send a close frame (status 1000 by default) and close the connection.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            await self._send_frame(CLOSE, code)
+        except ConnectionError:
+            pass
+        self.writer.close()
+
+    async def _send_frame(self, opcode, payload):
+        length = len(payload)
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, length)
+        elif length < 1 << 16:
+            header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+        self.writer.write(header)
+        self.writer.write(payload)
+        await self.writer.drain()
+
+    async def _read_frame(self):
+        first, second = await self.reader.readexactly(2)
+        if not first & 0x80 or first & 0x0F == CONTINUATION:
+            raise ValueError("Fragmented messages are not supported")
+        length = second & 0x7F
+        if length == 126:
+            length, = struct.unpack("!H", await self.reader.readexactly(2))
+        elif length == 127:
+            length, = struct.unpack("!Q", await self.reader.readexactly(8))
+        if length > MAX_MESSAGE:
+            raise ValueError(f"Message too large: {length} bytes")
+        if not second & 0x80:
+            raise ValueError("Client frames must be masked")
+        mask = await self.reader.readexactly(4)
+        payload = await self.reader.readexactly(length)
+        # Unmask by XOR with the repeated key, as one integer operation
+        key = int.from_bytes((mask * (length // 4 + 1))[:length], "big")
+        payload = (int.from_bytes(payload, "big") ^ key).to_bytes(length, "big")
+        return first & 0x0F, payload